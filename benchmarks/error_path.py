@@ -0,0 +1,85 @@
+"""
+Cost of `handle_result` on the success path vs the error path.
+
+Each simulated request runs a service through `return_service` and hands the
+result to `handle_result` from STACK_DEPTH nested coroutines, roughly the
+depth of a FastAPI request under its middleware stack. The error path is
+timed both with the frame lookup `handle_result` now uses and with the
+previous `inspect.stack()` based one. Logs go to a sink that drops them, so
+formatting is counted but not I/O.
+
+    APP_ENV=dev python -m benchmarks.error_path
+"""
+
+import asyncio
+import inspect
+import time
+
+from loguru import logger
+from starlette.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+
+from src.commons.middlewares.exception import AppExceptionCase, response_4xx
+from src.commons.services import service_result
+from src.commons.services.service_result import handle_result, return_service
+
+REQUESTS = 2_000
+STACK_DEPTH = 30
+
+
+def legacy_caller_info(depth: int = 2) -> str:
+    info = inspect.getframeinfo(inspect.stack()[depth][0])
+    return f"{info.filename}:{info.function}:{info.lineno}"
+
+
+class BenchService:
+    @return_service
+    async def found(self) -> dict:
+        return dict(status_code=HTTP_200_OK, content={"data": {"id": 1}})
+
+    @return_service
+    async def not_found(self) -> AppExceptionCase:
+        return response_4xx(
+            status_code=HTTP_404_NOT_FOUND, context={"reason": "User not found"}
+        )
+
+
+async def nested(depth: int, service_call) -> None:
+    if depth:
+        return await nested(depth - 1, service_call)
+    try:
+        await handle_result(await service_call())
+    except AppExceptionCase:
+        pass
+
+
+async def per_request_us(service_call) -> float:
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await nested(STACK_DEPTH, service_call)
+    return (time.perf_counter() - started) / REQUESTS * 1_000_000
+
+
+async def main() -> None:
+    logger.remove()
+    logger.add(lambda message: None, level="ERROR")
+    service = BenchService()
+
+    results = [("success", await per_request_us(service.found))]
+    results.append(("error", await per_request_us(service.not_found)))
+
+    caller_info = service_result.caller_info
+    service_result.caller_info = legacy_caller_info
+    try:
+        results.append(
+            ("error (inspect.stack)", await per_request_us(service.not_found))
+        )
+    finally:
+        service_result.caller_info = caller_info
+
+    print(f"{'path':>22} {'us/request':>11}")
+    for path, cost_us in results:
+        print(f"{path:>22} {cost_us:>11.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+"""
+Logging overhead per request at a steady 5k requests per second.
+
+Each simulated request logs what a real one does: an `uvicorn.access`
+line, the SQL statements SQLAlchemy echoes when `database_echo` is on, and
+one application line. Requests are paced in 1 ms ticks for DURATION_SEC,
+and every configuration is measured for the time spent logging on the
+request thread, the CPU the process burns in total (background writers
+included), and how long the sinks take to drain afterwards. Output goes to
+/dev/null, so encoding and write calls are counted but not terminal I/O.
+
+    APP_ENV=dev python -m benchmarks.logging_overhead
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from asgi_correlation_id.context import correlation_id
+from loguru import logger
+
+from src.commons.configs.logging import AccessLogSampler, CustomizeLogger
+
+RPS = 5_000
+DURATION_SEC = 2
+SQL_STATEMENTS = 3
+CONFIG_PATH = Path(__file__).resolve().parents[1] / "src" / "logging_conf.json"
+
+access_logger = logging.getLogger("uvicorn.access")
+sql_logger = logging.getLogger("sqlalchemy.engine.Engine")
+app_logger = logging.getLogger("src.apps.users.user_service")
+
+
+def configure(log_format: str, sample_rate: float, log_dir: str):
+    sampler = AccessLogSampler(default_rate=sample_rate, route_rates={})
+    if log_format == "json":
+        return CustomizeLogger.customize_json_logging(
+            level=logging.INFO,
+            batch_size=256,
+            flush_interval_ms=100,
+            access_log_sampler=sampler,
+        )
+    config = CustomizeLogger.load_logging_config(CONFIG_PATH)["logger"]
+    return CustomizeLogger.customize_logging(
+        Path(log_dir) / "bench.log",
+        level="info",
+        rotation=config["rotation"],
+        retention=config["retention"],
+        format=config["format"],
+        access_log_sampler=sampler,
+    )
+
+
+def request(number: int) -> None:
+    for statement in range(SQL_STATEMENTS):
+        sql_logger.info("SELECT users.id FROM users WHERE users.id = $%d", statement)
+        sql_logger.info("[cached since %.4gs ago] %r", 1.5, ("user-id",))
+    app_logger.info("Loaded user %s", number)
+    access_logger.info(
+        '%s - "%s %s HTTP/%s" %d',
+        "127.0.0.1:50000",
+        "GET",
+        "/api/users/me",
+        "1.1",
+        200,
+    )
+
+
+def run(log_format: str, echo: bool, sample_rate: float) -> tuple[float, ...]:
+    with tempfile.TemporaryDirectory() as log_dir:
+        configure(log_format, sample_rate, log_dir)
+        sql_logger.setLevel(logging.INFO if echo else logging.WARNING)
+
+        per_tick = RPS // 1000
+        requests = RPS * DURATION_SEC
+        logging_sec = 0.0
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        for tick in range(requests // per_tick):
+            for number in range(per_tick):
+                call_started = time.perf_counter()
+                request(tick * per_tick + number)
+                logging_sec += time.perf_counter() - call_started
+            delay = started + (tick + 1) / 1000 - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        drain_started = time.perf_counter()
+        logger.remove()
+        drain_ms = (time.perf_counter() - drain_started) * 1000
+        wall_sec = time.perf_counter() - started
+        cpu_sec = time.process_time() - cpu_started
+
+    return (
+        logging_sec / requests * 1_000_000,
+        cpu_sec / requests * 1_000_000,
+        cpu_sec / wall_sec * 100,
+        drain_ms,
+    )
+
+
+def main() -> None:
+    stdout = sys.stdout
+    correlation_id.set("benchmark")
+    access_logger.propagate = False
+    sql_logger.propagate = True
+
+    results = []
+    sys.stdout = open(os.devnull, "w")
+    try:
+        for name, log_format, echo, sample_rate in (
+            ("text, echo", "text", True, 1.0),
+            ("text", "text", False, 1.0),
+            ("json, echo", "json", True, 1.0),
+            ("json", "json", False, 1.0),
+            ("json, access 10%", "json", False, 0.1),
+        ):
+            results.append((name, *run(log_format, echo, sample_rate)))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    print(
+        f"{'mode':>18} {'caller us/req':>14} {'cpu us/req':>11} "
+        f"{'cpu %':>6} {'drain ms':>9}"
+    )
+    for name, caller_us, cpu_us, cpu_percent, drain_ms in results:
+        print(
+            f"{name:>18} {caller_us:>14.1f} {cpu_us:>11.1f} "
+            f"{cpu_percent:>6.1f} {drain_ms:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
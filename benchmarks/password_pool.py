@@ -0,0 +1,69 @@
+"""
+Event loop latency while bcrypt work runs inline vs on the password pool.
+
+A probe coroutine stands in for cheap `/users/me` traffic: it wakes up every
+millisecond and records how late it was scheduled. Concurrent "signins" hash
+passwords either on the loop thread or through `PasswordHasherPool`.
+
+    APP_ENV=dev python -m benchmarks.password_pool
+"""
+
+import asyncio
+import time
+
+from src.commons.utils.metrics import LatencyRecorder
+from src.commons.utils.password import (
+    PasswordHasherPool,
+    generate_salt,
+    get_password_hash,
+)
+
+SIGNINS = 32
+PROBE_INTERVAL_SEC = 0.001
+
+
+async def probe(stop: asyncio.Event, recorder: LatencyRecorder) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL_SEC)
+        late_ms = (time.perf_counter() - started - PROBE_INTERVAL_SEC) * 1000
+        recorder.observe(max(late_ms, 0.0))
+
+
+async def inline_signin(password: str) -> None:
+    get_password_hash(generate_salt() + password)
+    await asyncio.sleep(0)
+
+
+async def pooled_signin(pool: PasswordHasherPool, password: str) -> None:
+    await pool.run(get_password_hash, generate_salt() + password)
+
+
+async def run(label: str, signin) -> None:
+    stop = asyncio.Event()
+    recorder = LatencyRecorder(window=100_000)
+    probe_task = asyncio.create_task(probe(stop, recorder))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(signin(f"password-{i}") for i in range(SIGNINS)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe_task
+    stats = recorder.stats()
+    print(
+        f"{label:<8} signins={SIGNINS} total={elapsed:.2f}s "
+        f"probe_p50={stats['p50_ms']}ms probe_p99={stats['p99_ms']}ms "
+        f"probe_max={stats['max_ms']}ms"
+    )
+
+
+async def main() -> None:
+    pool = PasswordHasherPool(max_workers=4, max_pending=SIGNINS)
+    await run("inline", inline_signin)
+    await run("pooled", lambda password: pooled_signin(pool, password))
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""
+Per-request serialization cost of the `/users/me` response.
+
+Builds the response body for one user the way `get_current_user` used to,
+through `jsonable_encoder` and `JSONResponse`, and the way it does now,
+through a typed `UserDataResponse` rendered once by `ModelResponse`. Time is
+wall clock per response; allocations are the bytes and blocks tracemalloc
+reports while building one response: the peak above the starting point,
+and what is still held once the response exists.
+
+    APP_ENV=dev python -m benchmarks.response_serialization
+"""
+
+import time
+import tracemalloc
+import uuid
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.status import HTTP_200_OK
+
+from src.apps.users.user_schema import UserDataResponse, UserResponse
+from src.commons.constants.enum import USER_ROLES, USER_STATUS
+from src.commons.models.user_model import User
+from src.commons.services.response import ModelResponse
+
+RESPONSES = 20_000
+ALLOCATION_SAMPLES = 1_000
+
+
+def legacy_response(user: User) -> JSONResponse:
+    return JSONResponse(
+        status_code=HTTP_200_OK,
+        content={"data": jsonable_encoder(UserResponse.model_validate(user))},
+    )
+
+
+def model_response(user: User) -> ModelResponse:
+    return ModelResponse(
+        status_code=HTTP_200_OK,
+        content=UserDataResponse(data=UserResponse.model_validate(user)),
+    )
+
+
+def per_response_us(build, user: User) -> float:
+    started = time.perf_counter()
+    for _ in range(RESPONSES):
+        build(user)
+    return (time.perf_counter() - started) / RESPONSES * 1_000_000
+
+
+def allocations(build, user: User) -> tuple[float, float]:
+    """Peak bytes while building one response, and bytes the response keeps."""
+    peak = retained = 0
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_SAMPLES):
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            response = build(user)
+            current, high = tracemalloc.get_traced_memory()
+            peak += high - start
+            retained += current - start
+            del response
+    finally:
+        tracemalloc.stop()
+    return peak / ALLOCATION_SAMPLES, retained / ALLOCATION_SAMPLES
+
+
+def main() -> None:
+    user = User(
+        id=uuid.uuid4(),
+        email="someone@example.com",
+        full_name="Some One",
+        role=USER_ROLES.USER,
+        status=USER_STATUS.ACTIVE,
+        version=1,
+    )
+    assert orjson.loads(legacy_response(user).body) == orjson.loads(
+        model_response(user).body
+    )
+
+    print(f"{'pipeline':>24} {'us/resp':>8} {'peak B/resp':>12} {'kept B/resp':>12}")
+    for name, build in (
+        ("jsonable_encoder + json", legacy_response),
+        ("pydantic-core dump_json", model_response),
+    ):
+        cost_us = per_response_us(build, user)
+        peak, retained = allocations(build, user)
+        print(f"{name:>24} {cost_us:>8.1f} {peak:>12.0f} {retained:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-query CPU cost of the `get_user_by_email` lookup used by auth.
+
+Compares the statement as it used to be built (a fresh `select()` on every
+call) with the cached lambda statement, with and without SQLAlchemy's
+compiled-statement cache. Runs against in-memory SQLite so the numbers
+isolate statement construction, cache key and compile cost from network
+and Postgres time. Both statements use the repository's predicate and go
+through `read_query`, as the non-primary lookup does, and every result is
+checked against the email asked for.
+
+    APP_ENV=dev python -m benchmarks.statement_cache
+"""
+
+import time
+
+from sqlalchemy import and_, create_engine, func, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from src.apps.users.user_repository import ACTIVE_STATUS
+from src.commons.constants.enum import USER_ROLES, USER_STATUS
+from src.commons.database.repositories.base import BaseRepository
+from src.commons.models.base_model import CustomBaseModel
+from src.commons.models.user_model import User
+
+ITERATIONS = 20_000
+USERS = 100
+
+
+def plain_query(email: str):
+    return (
+        select(User)
+        .where(and_(func.lower(User.email) == email, User.status == ACTIVE_STATUS))
+        .limit(1)
+    )
+
+
+def lambda_query(email: str):
+    return lambda_stmt(
+        lambda: select(User)
+        .where(and_(func.lower(User.email) == email, User.status == ACTIVE_STATUS))
+        .limit(1)
+    )
+
+
+def seed(session: Session) -> None:
+    session.add_all(
+        User(
+            email=f"user{index}@bench.co",
+            full_name=f"user {index}",
+            salt="salt",
+            password="password",
+            role=USER_ROLES.USER,
+            status=USER_STATUS.ACTIVE,
+        )
+        for index in range(USERS)
+    )
+    session.commit()
+
+
+def run(label: str, query_cache_size: int, build_query) -> None:
+    engine = create_engine("sqlite://", query_cache_size=query_cache_size)
+    CustomBaseModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        seed(session)
+        repository = BaseRepository(session)
+        started = time.process_time()
+        for index in range(ITERATIONS):
+            email = f"user{index % USERS}@bench.co"
+            query = repository.read_query(build_query(email))
+            user = session.execute(query).scalars().first()
+            assert user.email == email, f"{label}: asked {email}, got {user.email}"
+        elapsed = time.process_time() - started
+
+    print(f"{label:<28} {elapsed / ITERATIONS * 1_000_000:8.1f} us/query")
+    engine.dispose()
+
+
+def main() -> None:
+    run("select, no compiled cache", 0, plain_query)
+    run("select, compiled cache", 500, plain_query)
+    run("lambda_stmt, compiled cache", 500, lambda_query)
+
+
+if __name__ == "__main__":
+    main()
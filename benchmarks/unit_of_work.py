@@ -0,0 +1,170 @@
+"""
+Commits, statements and latency per request: unit of work vs commit per method.
+
+Runs the shipped signup and profile-update paths, `AuthService.signup_user`
+and `UsersService.update_user`, each on a unit of work from
+`get_unit_of_work` that `return_service` commits once. They are compared
+with the same repository methods driven the way they ran before the unit of
+work: a commit right after each write, and a refresh after the insert.
+Sessions come from a factory configured like the app's, pointed through
+`search_path` at a `users` table in a scratch `bench_unit_of_work` schema,
+which is dropped afterwards. Signup latency is mostly bcrypt; the update
+isolates the database round trips.
+
+    APP_ENV=dev python -m benchmarks.unit_of_work
+"""
+
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.apps.auth.auth_service import AuthService
+from src.apps.dependencies.database import get_unit_of_work
+from src.apps.users.user_repository import UsersRepository
+from src.apps.users.user_schema import CreateUserRequest, UpdateUserRequest
+from src.apps.users.user_service import UsersService
+from src.commons.configs.config import get_app_settings
+from src.commons.database.repositories.base import SESSION_FACTORY
+from src.commons.database.routing import ReplicaSet, RoutingSession
+from src.commons.database.unit_of_work import UnitOfWork
+
+REQUESTS = 200
+SCHEMA = "bench_unit_of_work"
+
+
+async def unit_of_work_signup(session, settings, email: str) -> None:
+    result = await AuthService().signup_user(
+        payload=CreateUserRequest(full_name=email, password="password", email=email),
+        unit_of_work=get_unit_of_work(session),
+        settings=settings,
+    )
+    assert result.success
+
+
+async def unit_of_work_update(session, user_id, full_name: str) -> None:
+    result = await UsersService().update_user(
+        user_id=user_id,
+        payload=UpdateUserRequest(full_name=full_name),
+        unit_of_work=get_unit_of_work(session),
+    )
+    assert result.success
+
+
+async def per_method_signup(session, settings, email: str) -> None:
+    users_repo = UsersRepository(session)
+    assert not await users_repo.get_user_by_email(email=email, primary=True)
+    created_user = await users_repo.create_new_user(
+        user_data=CreateUserRequest(full_name=email, password="password", email=email)
+    )
+    await UnitOfWork(session).commit()
+    await session.refresh(created_user)
+    AuthService().create_token_for_user(user=created_user, settings=settings)
+
+
+async def per_method_update(session, user_id, full_name: str) -> None:
+    updated_user = await UsersRepository(session).update_user(
+        id=user_id, user_data=UpdateUserRequest(full_name=full_name)
+    )
+    assert updated_user is not None
+    await UnitOfWork(session).commit()
+
+
+async def measure(session_factory, counts, request) -> tuple[float, float, float]:
+    before = dict(counts)
+    samples = []
+    for index in range(REQUESTS):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            await request(session, index)
+            samples.append((time.perf_counter() - started) * 1000)
+    return (
+        (counts["commits"] - before["commits"]) / REQUESTS,
+        (counts["statements"] - before["statements"]) / REQUESTS,
+        statistics.median(samples),
+    )
+
+
+async def main() -> None:
+    settings = get_app_settings()
+    engine = create_async_engine(str(settings.database_url))
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(
+            text(f"CREATE TABLE {SCHEMA}.users (LIKE public.users INCLUDING ALL)")
+        )
+
+    bench_engine = create_async_engine(
+        str(settings.database_url),
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    counts = {"commits": 0, "statements": 0}
+    event.listen(
+        bench_engine.sync_engine,
+        "commit",
+        lambda conn: counts.update(commits=counts["commits"] + 1),
+    )
+    event.listen(
+        bench_engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: counts.update(statements=counts["statements"] + 1),
+    )
+    session_factory = sessionmaker(
+        bind=bench_engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replicas=ReplicaSet(engines=[], retry_after_sec=0),
+        expire_on_commit=False,
+        autoflush=True,
+    )
+    session_factory.configure(info={SESSION_FACTORY: session_factory})
+
+    async def user_id(email: str):
+        async with session_factory() as session:
+            user = await UsersRepository(session).get_user_by_email(
+                email=email, primary=True
+            )
+            return user.id
+
+    print(
+        f"{'request':>8} {'style':>17} {'commits/req':>12} "
+        f"{'statements/req':>15} {'median_ms':>10}"
+    )
+    for style, signup, update in (
+        ("commit per method", per_method_signup, per_method_update),
+        ("unit of work", unit_of_work_signup, unit_of_work_update),
+    ):
+        prefix = style.replace(" ", "-")
+        results = {
+            "signup": await measure(
+                session_factory,
+                counts,
+                lambda session, index: signup(
+                    session, settings, f"{prefix}-{index}@bench.co"
+                ),
+            )
+        }
+        target = await user_id(f"{prefix}-0@bench.co")
+        results["update"] = await measure(
+            session_factory,
+            counts,
+            lambda session, index: update(session, target, f"{prefix} #{index}"),
+        )
+        for request, (commits, statements, median_ms) in results.items():
+            print(
+                f"{request:>8} {style:>17} {commits:>12.1f} "
+                f"{statements:>15.1f} {median_ms:>10.2f}"
+            )
+
+    await bench_engine.dispose()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
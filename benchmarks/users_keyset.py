@@ -0,0 +1,116 @@
+"""
+Per-page latency of OFFSET vs keyset pagination on a large users table.
+
+Seeds a `users` table in a scratch `bench_keyset` schema (same columns and
+indexes as the real one) with ROWS synthetic users, and points the session
+at it through `search_path`. Each depth is then fetched both with an
+OFFSET query and the way `GET /users` does it: the previous page's cursor
+goes through `encode_cursor`/`decode_cursor` and into
+`UsersRepository.get_filtered_users`, and the page returned is checked
+against the OFFSET one. Needs a migrated database reachable through the
+app settings; the scratch schema is dropped afterwards.
+
+    APP_ENV=dev python -m benchmarks.users_keyset
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.apps.users.user_repository import UsersRepository
+from src.commons.configs.config import get_app_settings
+from src.commons.models.user_model import User
+from src.commons.utils.cursor import decode_cursor, encode_cursor
+
+ROWS = 1_000_000
+PAGE_SIZE = 100
+DEPTHS = [0, 1_000, 10_000, 100_000, 500_000, 900_000]
+REPEAT = 5
+SCHEMA = "bench_keyset"
+
+
+def offset_query(offset: int):
+    return (
+        select(User)
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(PAGE_SIZE)
+        .offset(offset)
+    )
+
+
+async def seed(conn) -> None:
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(
+        text(f"CREATE TABLE {SCHEMA}.users (LIKE public.users INCLUDING ALL)")
+    )
+    await conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA}.users "
+            "(id, email, full_name, salt, password, role, status, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'user' || n || '@bench.co', 'user ' || n, "
+            "'salt', 'password', 'USER', 'ACTIVE', "
+            "now() - n * interval '1 second', now() "
+            "FROM generate_series(1, :rows) AS n"
+        ),
+        {"rows": ROWS},
+    )
+    await conn.execute(text(f"ANALYZE {SCHEMA}.users"))
+
+
+async def best_ms(run) -> tuple[float, list]:
+    best, result = float("inf"), None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = await run()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+
+async def main() -> None:
+    settings = get_app_settings()
+    engine = create_async_engine(str(settings.database_url))
+    async with engine.begin() as conn:
+        await seed(conn)
+
+    bench_engine = create_async_engine(
+        str(settings.database_url),
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    async with AsyncSession(bench_engine) as session:
+        users_repo = UsersRepository(session)
+        print(f"{'depth':>8} {'offset_ms':>10} {'keyset_ms':>10}")
+        for depth in DEPTHS:
+
+            async def offset_page():
+                return (await session.execute(offset_query(depth))).scalars().all()
+
+            offset_ms, expected = await best_ms(offset_page)
+
+            after = None
+            if depth:
+                previous = (
+                    (await session.execute(offset_query(depth - 1).limit(1)))
+                    .scalars()
+                    .one()
+                )
+                after = decode_cursor(encode_cursor(previous.created_at, previous.id))
+
+            async def keyset_page():
+                return await users_repo.get_filtered_users(limit=PAGE_SIZE, after=after)
+
+            keyset_ms, page = await best_ms(keyset_page)
+            assert [user.id for user in page] == [user.id for user in expected]
+            print(f"{depth:>8} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+    await bench_engine.dispose()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
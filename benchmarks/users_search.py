@@ -0,0 +1,115 @@
+"""
+Latency of the trigram-indexed user search on a large users table.
+
+Seeds a `users` table in a scratch `bench_search` schema (same columns and
+indexes as the real one, so the pg_trgm migration must be applied) with
+ROWS synthetic users, and points the session at it through `search_path`.
+Each term then goes through `UsersRepository.search_users`, the query
+`GET /users/search` runs, with its LIKE escaping and `statement_timeout`,
+and the best and median time are reported against the 50 ms budget; a
+search cancelled by the timeout is counted rather than timed. The scratch
+schema is dropped afterwards.
+
+    APP_ENV=dev python -m benchmarks.users_search
+"""
+
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from src.apps.users.user_repository import UsersRepository
+from src.commons.configs.config import get_app_settings
+from src.commons.middlewares.exception import AppExceptionCase
+
+ROWS = 1_000_000
+LIMIT = 20
+REPEAT = 10
+BUDGET_MS = 50
+SCHEMA = "bench_search"
+TERMS = ["user4242", "nguyen", "hoang tuan", "@bench.co", "100%", "xyzzy"]
+
+FIRST_NAMES = "ARRAY['anh', 'binh', 'chi', 'dung', 'hoa', 'khanh', 'linh', 'tuan']"
+LAST_NAMES = "ARRAY['nguyen', 'tran', 'le', 'pham', 'hoang', 'vu', 'vo', 'dang']"
+
+
+async def seed(conn) -> None:
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(
+        text(f"CREATE TABLE {SCHEMA}.users (LIKE public.users INCLUDING ALL)")
+    )
+    await conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA}.users "
+            "(id, email, full_name, salt, password, role, status, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'user' || n || '@bench.co', "
+            f"({FIRST_NAMES})[1 + n % 8] || ' ' || ({LAST_NAMES})[1 + (n / 8) % 8] "
+            f"|| ' ' || ({FIRST_NAMES})[1 + (n / 64) % 8] || n, "
+            "'salt', 'password', 'USER', 'ACTIVE', now(), now() "
+            "FROM generate_series(1, :rows) AS n"
+        ),
+        {"rows": ROWS},
+    )
+    await conn.execute(text(f"ANALYZE {SCHEMA}.users"))
+
+
+async def timed(users_repo: UsersRepository, term: str, timeout_ms: int):
+    samples, timeouts = [], 0
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        try:
+            await users_repo.search_users(term=term, limit=LIMIT, timeout_ms=timeout_ms)
+        except AppExceptionCase as search_error:
+            if search_error.status_code != HTTP_503_SERVICE_UNAVAILABLE:
+                raise
+            timeouts += 1
+        else:
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            await users_repo.release()
+    return samples, timeouts
+
+
+async def main() -> None:
+    settings = get_app_settings()
+    engine = create_async_engine(str(settings.database_url))
+    async with engine.begin() as conn:
+        await seed(conn)
+
+    bench_engine = create_async_engine(
+        str(settings.database_url),
+        connect_args={"server_settings": {"search_path": f"{SCHEMA}, public"}},
+    )
+    async with AsyncSession(bench_engine) as session:
+        users_repo = UsersRepository(session)
+        print(
+            f"{'term':>12} {'best_ms':>9} {'median_ms':>10} "
+            f"{'timeouts':>9} {'budget':>7}"
+        )
+        for term in TERMS:
+            samples, timeouts = await timed(
+                users_repo, term, settings.user_search_timeout_ms
+            )
+            if not samples:
+                print(f"{term:>12} {'-':>9} {'-':>10} {timeouts:>9} {'SLOW':>7}")
+                continue
+            median_ms = statistics.median(samples)
+            verdict = "ok" if median_ms < BUDGET_MS and not timeouts else "SLOW"
+            print(
+                f"{term:>12} {min(samples):>9.2f} {median_ms:>10.2f} "
+                f"{timeouts:>9} {verdict:>7}"
+            )
+
+    await bench_engine.dispose()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
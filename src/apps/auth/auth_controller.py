@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends
 from starlette.status import HTTP_200_OK, HTTP_201_CREATED
 
-from src.apps.dependencies.database import get_repository
+from src.apps.dependencies.auth import get_token_version_store
+from src.apps.dependencies.database import get_repository, get_unit_of_work
 from src.apps.dependencies.service import get_service
 from src.apps.users.user_repository import UsersRepository
 from src.apps.users.user_schema import CreateUserRequest, UserResponse
 from src.commons.configs.config import BaseSettings, get_app_settings
+from src.commons.database.unit_of_work import UnitOfWork
 from src.commons.middlewares.exception import ERROR_RESPONSES
 from src.commons.models.user_model import User
 from src.commons.services.service_result import ServiceResult, handle_result
+from src.commons.stores.token_version import TokenVersionStore
 
 from .auth_schema import SignInRequest
 from .auth_service import AuthService
@@ -27,14 +30,14 @@ async def signup_user(
     *,
     payload: CreateUserRequest,
     auth_service: AuthService = Depends(get_service(AuthService)),
-    users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
     settings: BaseSettings = Depends(get_app_settings),
 ) -> ServiceResult:
     """
     Signup new users.
     """
     result = await auth_service.signup_user(
-        payload=payload, users_repo=users_repo, settings=settings
+        payload=payload, unit_of_work=unit_of_work, settings=settings
     )
 
     return await handle_result(result)
@@ -53,6 +56,7 @@ async def signin_user(
     auth_service: AuthService = Depends(get_service(AuthService)),
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     settings: BaseSettings = Depends(get_app_settings),
+    token_versions: TokenVersionStore = Depends(get_token_version_store),
 ) -> ServiceResult:
     """
     Create new users.
@@ -61,6 +65,7 @@ async def signin_user(
         payload=payload,
         users_repo=users_repo,
         settings=settings,
+        token_versions=token_versions,
     )
 
     return await handle_result(result)
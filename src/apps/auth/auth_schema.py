@@ -1,8 +1,9 @@
 from datetime import datetime
 
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, ConfigDict, UUID4, field_validator
 
 from src.commons.constants.enum import USER_ROLES
+from src.commons.utils.string import normalize_email
 
 
 class TokenBase(BaseModel):
@@ -15,8 +16,28 @@ class TokenUser(BaseModel):
     full_name: str
     email: str
     role: str
+    ver: int = 0
+
+
+class TokenPayload(TokenBase, TokenUser):
+    pass
+
+
+class Principal(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True,
+    )
+
+    id: UUID4
+    email: str
+    role: USER_ROLES
 
 
 class SignInRequest(BaseModel):
     email: str
     password: str
+
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str) -> str:
+        return normalize_email(email)
@@ -1,20 +1,26 @@
 from datetime import UTC, datetime, timedelta
 
-from fastapi.encoders import jsonable_encoder
 from jwt import decode, encode
 from starlette.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 
 from src.apps.users.user_repository import UsersRepository
-from src.apps.users.user_schema import CreateUserRequest, UserAuthResponse, UserResponse
+from src.apps.users.user_schema import (
+    CreateUserRequest,
+    UserAuthDataResponse,
+    UserAuthResponse,
+    UserResponse,
+)
 from src.commons.configs.config import BaseSettings
 from src.commons.constants.enum import USER_STATUS
 from src.commons.constants.message import ERROR_MESSAGE
+from src.commons.database.unit_of_work import UnitOfWork
 from src.commons.middlewares.exception import response_4xx
 from src.commons.models.user_model import User
 from src.commons.services.base import BaseService
 from src.commons.services.service_result import return_service
+from src.commons.stores.token_version import TokenVersionStore
 
-from .auth_schema import SignInRequest, TokenBase, TokenUser
+from .auth_schema import SignInRequest, TokenBase, TokenPayload, TokenUser
 
 ALGORITHM = "HS256"
 
@@ -32,12 +38,18 @@ class AuthService(BaseService):
         encoded_jwt = encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
         return encoded_jwt
 
-    def create_token_for_user(self, user: User, settings: BaseSettings) -> str:
+    def create_token_for_user(
+        self,
+        user: User,
+        settings: BaseSettings,
+        token_version: int = 0,
+    ) -> str:
         token_user = TokenUser(
             id=str(user.id),
             full_name=user.full_name,
             email=user.email,
             role=user.role,
+            ver=token_version,
         ).model_dump()
         access_token = self.create_token(content=token_user, settings=settings)
         return access_token
@@ -46,10 +58,10 @@ class AuthService(BaseService):
         self,
         token: str,
         settings: BaseSettings,
-    ) -> TokenUser:
+    ) -> TokenPayload:
         try:
             decoded_user = decode(token, settings.secret_key, algorithms=ALGORITHM)
-            return TokenUser(**decoded_user)
+            return TokenPayload(**decoded_user)
 
         except Exception as decode_error:
             raise ValueError(ERROR_MESSAGE.INVALID_TOKEN) from decode_error
@@ -58,10 +70,13 @@ class AuthService(BaseService):
     async def signup_user(
         self,
         payload: CreateUserRequest,
-        users_repo: UsersRepository,
+        unit_of_work: UnitOfWork,
         settings: BaseSettings,
     ) -> UserResponse:
-        duplicate_user = await users_repo.get_user_by_email(email=payload.email)
+        users_repo = unit_of_work.repository(UsersRepository)
+        duplicate_user = await users_repo.get_user_by_email(
+            email=payload.email, primary=True
+        )
 
         if duplicate_user:
             return response_4xx(
@@ -77,9 +92,7 @@ class AuthService(BaseService):
 
         return dict(
             status_code=HTTP_201_CREATED,
-            content={
-                "data": jsonable_encoder(user_response),
-            },
+            content=UserAuthDataResponse(data=user_response),
         )
 
     @return_service
@@ -88,8 +101,10 @@ class AuthService(BaseService):
         payload: SignInRequest,
         users_repo: UsersRepository,
         settings: BaseSettings,
+        token_versions: TokenVersionStore,
     ) -> UserResponse:
-        user = await users_repo.get_user_by_email(email=payload.email)
+        # Cached users carry no password hash, so signin reads the primary.
+        user = await users_repo.get_user_by_email(email=payload.email, primary=True)
 
         if not user:
             return response_4xx(
@@ -112,13 +127,14 @@ class AuthService(BaseService):
                 context={"reason": ERROR_MESSAGE.USER_NOT_ACTIVE},
             )
 
-        access_token = self.create_token_for_user(user=user, settings=settings)
+        token_version = await token_versions.get(user_id=str(user.id))
+        access_token = self.create_token_for_user(
+            user=user, settings=settings, token_version=token_version
+        )
         user_data_with_auth = UserAuthResponse.model_validate(user)
         user_data_with_auth.token = access_token
 
         return dict(
             status_code=HTTP_200_OK,
-            content={
-                "data": jsonable_encoder(user_data_with_auth),
-            },
+            content=UserAuthDataResponse(data=user_data_with_auth),
         )
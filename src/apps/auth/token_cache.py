@@ -0,0 +1,58 @@
+import hashlib
+from datetime import UTC, datetime
+from functools import lru_cache
+
+from src.commons.configs.config import get_app_settings
+from src.commons.database.change_feed import USER_CHANGES_CHANNEL, get_change_feed
+from src.commons.models.user_model import User
+from src.commons.utils.cache import TTLCache
+from src.commons.utils.metrics import register_metrics
+
+
+class TokenCache:
+    """Verified bearer tokens mapped to the user they resolved to."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> User | None:
+        return self._entries.get(self.digest(token))
+
+    def set(self, token: str, user: User, expires_at: datetime) -> None:
+        ttl = min(
+            self._entries.ttl,
+            (expires_at - datetime.now(UTC)).total_seconds(),
+        )
+        self._entries.set(self.digest(token), user, ttl=ttl)
+
+    def invalidate_user(self, user_id: str) -> None:
+        self._entries.discard_where(lambda user: str(user.id) == str(user_id))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def on_user_change(self, event: dict | None) -> None:
+        if event is None:
+            self.clear()
+        else:
+            self.invalidate_user(event["id"])
+
+    def stats(self) -> dict[str, int | float]:
+        return self._entries.stats()
+
+
+@lru_cache
+def get_token_cache() -> TokenCache:
+    settings = get_app_settings()
+    token_cache = TokenCache(
+        maxsize=settings.token_cache_size,
+        ttl=settings.token_cache_ttl_sec,
+    )
+    register_metrics("token_cache", token_cache.stats)
+    get_change_feed().subscribe(USER_CHANGES_CHANNEL, token_cache.on_user_change)
+
+    return token_cache
@@ -4,13 +4,16 @@ from starlette.status import (
     HTTP_401_UNAUTHORIZED,
 )
 
+from src.apps.auth.auth_schema import Principal
 from src.apps.auth.auth_service import AuthService
+from src.apps.auth.token_cache import TokenCache, get_token_cache
 from src.apps.dependencies.database import get_repository
 from src.apps.dependencies.service import get_service
 from src.apps.users.user_repository import UsersRepository
 from src.commons.configs.config import BaseSettings, get_app_settings
 from src.commons.constants.message import ERROR_MESSAGE
 from src.commons.models.user_model import User
+from src.commons.stores.token_version import TokenVersionStore
 
 
 class CustomAPIKeyHeader(APIKeyHeader):
@@ -24,6 +27,10 @@ class CustomAPIKeyHeader(APIKeyHeader):
             )
 
 
+def get_token_version_store(request: Request) -> TokenVersionStore:
+    return request.app.state.token_versions
+
+
 def _get_auth_from_header(
     api_key: str = Security(CustomAPIKeyHeader(name="Authorization")),
     settings: BaseSettings = Depends(get_app_settings),
@@ -49,7 +56,12 @@ async def get_current_user(
     token: str = Depends(_get_auth_from_header),
     settings: BaseSettings = Depends(get_app_settings),
     auth_service: AuthService = Depends(get_service(AuthService)),
+    token_cache: TokenCache = Depends(get_token_cache),
 ) -> User:
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     try:
         token_user = auth_service.get_user_from_token(token=token, settings=settings)
     except ValueError:
@@ -60,6 +72,7 @@ async def get_current_user(
 
     try:
         user = await users_repo.get_user_by_email(email=token_user.email)
+        await users_repo.release()
 
         if user is None:
             raise HTTPException(
@@ -67,6 +80,7 @@ async def get_current_user(
                 detail=ERROR_MESSAGE.INVALID_TOKEN,
             )
         else:
+            token_cache.set(token, user, expires_at=token_user.exp)
             return user
 
     except ValueError:
@@ -74,3 +88,46 @@ async def get_current_user(
             status_code=HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGE.INVALID_TOKEN,
         )
+
+
+async def get_current_principal(
+    users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
+    token: str = Depends(_get_auth_from_header),
+    settings: BaseSettings = Depends(get_app_settings),
+    auth_service: AuthService = Depends(get_service(AuthService)),
+    token_cache: TokenCache = Depends(get_token_cache),
+    token_versions: TokenVersionStore = Depends(get_token_version_store),
+) -> Principal:
+    """
+    Identity and role of the caller.
+
+    With `auth_principal_mode` enabled it is built from the verified token
+    claims and checked against the token version store, so no users row is
+    loaded. Otherwise it falls back to `get_current_user`.
+    """
+    if not settings.auth_principal_mode:
+        user = await get_current_user(
+            users_repo=users_repo,
+            token=token,
+            settings=settings,
+            auth_service=auth_service,
+            token_cache=token_cache,
+        )
+        return Principal.model_validate(user)
+
+    try:
+        token_user = auth_service.get_user_from_token(token=token, settings=settings)
+        principal = Principal.model_validate(token_user, from_attributes=True)
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGE.INVALID_TOKEN,
+        )
+
+    if token_user.ver != await token_versions.get(user_id=token_user.id):
+        raise HTTPException(
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGE.INVALID_TOKEN,
+        )
+
+    return principal
@@ -5,9 +5,11 @@ from fastapi import Depends
 from fastapi.requests import Request
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
 from src.commons.constants.message import ERROR_MESSAGE
 from src.commons.database.repositories.base import BaseRepository
+from src.commons.database.unit_of_work import UnitOfWork
 from src.commons.middlewares.exception import AppExceptionCase
 
 
@@ -29,13 +31,15 @@ def db_error_handler(func) -> callable:
     return wrapper
 
 
-def _get_db_session(request: Request) -> AsyncSession:
+def get_session_factory(request: Request) -> sessionmaker:
     return request.app.state.pool
 
 
 async def _get_connection_from_session(
-    pool: AsyncSession = Depends(_get_db_session),
+    pool: sessionmaker = Depends(get_session_factory),
 ) -> AsyncGenerator[AsyncSession, None]:
+    # The session only checks out a connection on its first execute, and
+    # services release it when they return (see `return_service`).
     async with pool() as session:
         yield session
 
@@ -49,3 +53,9 @@ def get_repository(
         return repo_type(session)
 
     return _get_repo
+
+
+def get_unit_of_work(
+    session: AsyncSession = Depends(_get_connection_from_session),
+) -> UnitOfWork:
+    return UnitOfWork(session)
@@ -0,0 +1,85 @@
+import asyncio
+from collections.abc import Sequence
+from uuid import UUID
+
+from fastapi import Depends
+
+from src.apps.dependencies.database import get_repository
+from src.apps.users.user_repository import UsersRepository
+from src.commons.models.user_model import User
+
+
+class UserLoader:
+    """
+    Request-scoped batching for user lookups by id.
+
+    Concurrent `load` calls are answered by one `get_users_by_ids` query, and
+    each id is fetched at most once per request. Only POST /users/batch-get
+    loads through it; single lookups such as the auth dependency call
+    `get_user_by_id`, which is cached and coalesced per process instead.
+    """
+
+    def __init__(self, users_repo: UsersRepository) -> None:
+        self._users_repo = users_repo
+        self._futures: dict[UUID, asyncio.Future] = {}
+        self._pending: list[UUID] = []
+        self._dispatch_task: asyncio.Task | None = None
+        # One batch at a time: the repository's session cannot run two
+        # queries at once, and each batch releases it when done.
+        self._lock = asyncio.Lock()
+
+    async def load(self, user_id: str | UUID) -> User | None:
+        try:
+            key = UUID(str(user_id))
+        except ValueError:
+            return None
+
+        future = self._futures.get(key)
+        if future is None:
+            future = self._futures[key] = asyncio.get_running_loop().create_future()
+            self._pending.append(key)
+            if len(self._pending) == 1:
+                self._dispatch_task = asyncio.create_task(self._dispatch())
+
+        return await asyncio.shield(future)
+
+    async def load_many(self, user_ids: Sequence[str | UUID]) -> list[User | None]:
+        return list(await asyncio.gather(*(self.load(user_id) for user_id in user_ids)))
+
+    async def _dispatch(self) -> None:
+        keys: list[UUID] = []
+        try:
+            # Let tasks started in this turn (e.g. by a nested gather) queue
+            # their ids before the batch is taken.
+            queued = 0
+            while queued != len(self._pending):
+                queued = len(self._pending)
+                await asyncio.sleep(0)
+
+            async with self._lock:
+                keys, self._pending = self._pending, []
+                try:
+                    users = await self._users_repo.get_users_by_ids(user_ids=keys)
+                finally:
+                    await self._users_repo.release()
+        except asyncio.CancelledError:
+            # Ids still queued belong to this batch until it takes them.
+            if not keys:
+                keys, self._pending = self._pending, []
+            for key in keys:
+                self._futures.pop(key).cancel()
+            raise
+        except Exception as load_error:
+            for key in keys:
+                self._futures.pop(key).set_exception(load_error)
+            return
+
+        users_by_id = {user.id: user for user in users}
+        for key in keys:
+            self._futures[key].set_result(users_by_id.get(key))
+
+
+def get_user_loader(
+    users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
+) -> UserLoader:
+    return UserLoader(users_repo)
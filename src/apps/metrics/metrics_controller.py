@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from starlette.status import HTTP_200_OK
+
+from src.apps.auth.auth_schema import Principal
+from src.apps.dependencies.auth import get_current_principal
+from src.apps.dependencies.role import is_valid_role
+from src.commons.constants.enum import USER_ROLES
+from src.commons.middlewares.exception import ERROR_RESPONSES
+from src.commons.utils.metrics import collect_metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    status_code=HTTP_200_OK,
+    responses=ERROR_RESPONSES,
+    name="metrics:get-metrics",
+)
+async def get_metrics(
+    *,
+    principal: Principal = Depends(get_current_principal),
+    is_valid_role=Depends(
+        is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
+    ),
+) -> dict:
+    """
+    In-process cache, pool and worker counters of this worker.
+    """
+    return {"data": collect_metrics()}
@@ -0,0 +1,63 @@
+"""
+Bulk-import users from a CSV (full_name,email,password) or NDJSON file.
+
+    APP_ENV=dev python -m src.apps.users.import_cli users.csv
+    APP_ENV=dev python -m src.apps.users.import_cli users.ndjson --format ndjson
+
+The whole file is imported in one transaction; rejected rows are printed
+and do not stop the import.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.commons.configs.config import get_app_settings
+from src.commons.constants.enum import EXPORT_FORMAT
+from src.commons.database.unit_of_work import UnitOfWork
+
+from .user_import import import_users
+from .user_repository import UsersRepository
+
+
+async def main(path: Path, import_format: EXPORT_FORMAT) -> None:
+    settings = get_app_settings()
+    engine = create_async_engine(str(settings.database_url))
+
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            unit_of_work = UnitOfWork(session)
+            report = await import_users(
+                content=path.read_bytes(),
+                import_format=import_format,
+                users_repo=unit_of_work.repository(UsersRepository),
+                batch_size=settings.import_batch_size,
+                hash_workers=settings.import_hash_workers,
+            )
+            await unit_of_work.commit()
+    finally:
+        await engine.dispose()
+
+    for error in report.errors:
+        print(json.dumps(error.model_dump()))
+    print(
+        f"Imported {report.inserted} of {report.total} users, "
+        f"{report.failed} failed, in {report.elapsed_sec}s "
+        f"({report.rows_per_sec} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import users.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument(
+        "--format",
+        choices=[export_format.value for export_format in EXPORT_FORMAT],
+        help="defaults to the file extension",
+    )
+    args = parser.parse_args()
+    import_format = args.format or args.path.suffix.lstrip(".").lower()
+    asyncio.run(main(args.path, EXPORT_FORMAT(import_format)))
@@ -1,19 +1,42 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, Header, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import sessionmaker
 from starlette.status import HTTP_200_OK
 
-from src.apps.dependencies.auth import get_current_user
-from src.apps.dependencies.database import get_repository
+from src.apps.auth.auth_schema import Principal
+from src.apps.dependencies.auth import (
+    get_current_principal,
+    get_current_user,
+    get_token_version_store,
+)
+from src.apps.dependencies.database import (
+    get_repository,
+    get_session_factory,
+    get_unit_of_work,
+)
+from src.apps.dependencies.loader import UserLoader, get_user_loader
 from src.apps.dependencies.role import is_valid_role
 from src.apps.dependencies.service import get_service
 from src.apps.users.user_repository import UsersRepository
-from src.commons.constants.enum import USER_ROLES
+from src.commons.configs.config import BaseSettings, get_app_settings
+from src.commons.constants.enum import EXPORT_FORMAT, USER_ROLES, USER_STATUS
+from src.commons.database.unit_of_work import UnitOfWork
 from src.commons.models.user_model import User
 
 
-from .user_schema import UpdateUserRequest, UserResponse
+from .user_schema import (
+    UpdateUserRequest,
+    UserResponse,
+    UsersBatchGetRequest,
+    UsersBatchResponse,
+    UsersImportResponse,
+    UsersPageResponse,
+    UsersSearchResponse,
+)
 from .user_service import UsersService
 from src.commons.middlewares.exception import ERROR_RESPONSES
 from src.commons.services.service_result import handle_result
+from src.commons.stores.token_version import TokenVersionStore
 
 router = APIRouter()
 
@@ -29,8 +52,150 @@ async def get_current_user_info(
     *,
     user: User = Depends(get_current_user),
     user_service: UsersService = Depends(get_service(UsersService)),
+    if_none_match: str | None = Header(default=None),
 ) -> UserResponse:
-    result = await user_service.get_current_user(user=user)
+    result = await user_service.get_current_user(user=user, if_none_match=if_none_match)
+
+    return await handle_result(result)
+
+
+@router.get(
+    "",
+    status_code=HTTP_200_OK,
+    response_model=UsersPageResponse,
+    responses=ERROR_RESPONSES,
+    name="user:list",
+)
+async def list_users(
+    *,
+    principal: Principal = Depends(get_current_principal),
+    is_valid_role=Depends(
+        is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
+    ),
+    users_service: UsersService = Depends(get_service(UsersService)),
+    users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    status: USER_STATUS | None = None,
+    role: USER_ROLES | None = None,
+) -> UsersPageResponse:
+    filters = users_service.get_users_filters(
+        cursor=cursor, limit=limit, status=status, role=role
+    )
+    result = await users_service.get_users(filters=filters, users_repo=users_repo)
+
+    return await handle_result(result)
+
+
+@router.get(
+    "/export",
+    status_code=HTTP_200_OK,
+    responses=ERROR_RESPONSES,
+    name="user:export",
+)
+async def export_users(
+    *,
+    principal: Principal = Depends(get_current_principal),
+    is_valid_role=Depends(
+        is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
+    ),
+    users_service: UsersService = Depends(get_service(UsersService)),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    settings: BaseSettings = Depends(get_app_settings),
+    format: EXPORT_FORMAT = EXPORT_FORMAT.NDJSON,
+) -> StreamingResponse:
+    media_type = "text/csv" if format == EXPORT_FORMAT.CSV else "application/x-ndjson"
+    content = users_service.export_users(
+        session_factory=session_factory,
+        export_format=format,
+        batch_size=settings.export_batch_size,
+    )
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=users.{format.value}"},
+    )
+
+
+@router.post(
+    "/import",
+    status_code=HTTP_200_OK,
+    response_model=UsersImportResponse,
+    responses=ERROR_RESPONSES,
+    name="user:import",
+)
+async def import_users(
+    *,
+    principal: Principal = Depends(get_current_principal),
+    is_valid_role=Depends(
+        is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
+    ),
+    users_service: UsersService = Depends(get_service(UsersService)),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+    settings: BaseSettings = Depends(get_app_settings),
+    file: UploadFile = File(...),
+    format: EXPORT_FORMAT = EXPORT_FORMAT.CSV,
+) -> UsersImportResponse:
+    result = await users_service.import_users(
+        content=await file.read(),
+        import_format=format,
+        unit_of_work=unit_of_work,
+        settings=settings,
+    )
+
+    return await handle_result(result)
+
+
+@router.get(
+    "/search",
+    status_code=HTTP_200_OK,
+    response_model=UsersSearchResponse,
+    responses=ERROR_RESPONSES,
+    name="user:search",
+)
+async def search_users(
+    *,
+    principal: Principal = Depends(get_current_principal),
+    is_valid_role=Depends(
+        is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
+    ),
+    users_service: UsersService = Depends(get_service(UsersService)),
+    users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
+    settings: BaseSettings = Depends(get_app_settings),
+    q: str = Query(min_length=3, max_length=100),
+    limit: int = Query(default=20, ge=1, le=50),
+) -> UsersSearchResponse:
+    result = await users_service.search_users(
+        term=q,
+        limit=limit,
+        timeout_ms=settings.user_search_timeout_ms,
+        users_repo=users_repo,
+    )
+
+    return await handle_result(result)
+
+
+@router.post(
+    "/batch-get",
+    status_code=HTTP_200_OK,
+    response_model=UsersBatchResponse,
+    responses=ERROR_RESPONSES,
+    name="user:batch-get",
+)
+async def batch_get_users(
+    *,
+    principal: Principal = Depends(get_current_principal),
+    is_valid_role=Depends(
+        is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
+    ),
+    users_service: UsersService = Depends(get_service(UsersService)),
+    user_loader: UserLoader = Depends(get_user_loader),
+    payload: UsersBatchGetRequest,
+) -> UsersBatchResponse:
+    result = await users_service.get_users_by_ids(
+        user_ids=payload.ids, user_loader=user_loader
+    )
 
     return await handle_result(result)
 
@@ -44,15 +209,18 @@ async def get_current_user_info(
 )
 async def read_user_by_id(
     *,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     is_valid_role=Depends(
         is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
     ),
     users_service: UsersService = Depends(get_service(UsersService)),
     users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
     user_id: str,
+    if_none_match: str | None = Header(default=None),
 ) -> UserResponse:
-    result = await users_service.get_user_by_id(user_id=user_id, users_repo=users_repo)
+    result = await users_service.get_user_by_id(
+        user_id=user_id, users_repo=users_repo, if_none_match=if_none_match
+    )
 
     return await handle_result(result)
 
@@ -66,17 +234,21 @@ async def read_user_by_id(
 )
 async def update_user(
     *,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     is_valid_role=Depends(
         is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
     ),
     users_service: UsersService = Depends(get_service(UsersService)),
-    users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
     payload: UpdateUserRequest,
     user_id: str,
+    if_match: str | None = Header(default=None),
 ) -> UserResponse:
     result = await users_service.update_user(
-        user_id=user_id, payload=payload, users_repo=users_repo
+        user_id=user_id,
+        payload=payload,
+        unit_of_work=unit_of_work,
+        if_match=if_match,
     )
     return await handle_result(result)
 
@@ -90,13 +262,20 @@ async def update_user(
 )
 async def delete_user(
     *,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     is_valid_role=Depends(
         is_valid_role(list_role=[USER_ROLES.ADMIN, USER_ROLES.SUPER_ADMIN])
     ),
     users_service: UsersService = Depends(get_service(UsersService)),
-    users_repo: UsersRepository = Depends(get_repository(UsersRepository)),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+    token_versions: TokenVersionStore = Depends(get_token_version_store),
     user_id: str,
+    if_match: str | None = Header(default=None),
 ) -> UserResponse:
-    result = await users_service.delete_user(user_id=user_id, users_repo=users_repo)
+    result = await users_service.delete_user(
+        user_id=user_id,
+        unit_of_work=unit_of_work,
+        token_versions=token_versions,
+        if_match=if_match,
+    )
     return await handle_result(result)
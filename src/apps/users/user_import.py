@@ -0,0 +1,156 @@
+import csv
+import io
+import logging
+import time
+from collections.abc import Iterator
+
+import orjson
+from pydantic import ValidationError
+
+from src.commons.constants.enum import EXPORT_FORMAT, USER_ROLES
+from src.commons.constants.message import ERROR_MESSAGE
+from src.commons.utils.password import hash_passwords_in_processes
+
+from .user_repository import UsersRepository
+from .user_schema import CreateUserRequest, UsersImportError, UsersImportResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_rows(
+    content: bytes, import_format: EXPORT_FORMAT
+) -> Iterator[tuple[int, dict | None]]:
+    """(row number, fields) per data row; fields is None when unparsable."""
+    if import_format == EXPORT_FORMAT.CSV:
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+        for row, fields in enumerate(reader, start=1):
+            yield row, fields
+        return
+
+    for row, line in enumerate(content.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            fields = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            fields = None
+        yield row, fields if isinstance(fields, dict) else None
+
+
+def _validation_reason(validation_error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+        for error in validation_error.errors()
+    )
+
+
+async def import_users(
+    *,
+    content: bytes,
+    import_format: EXPORT_FORMAT,
+    users_repo: UsersRepository,
+    batch_size: int,
+    hash_workers: int,
+    max_rows: int | None = None,
+) -> UsersImportResponse:
+    """
+    Validate, hash and insert the users of a CSV or NDJSON file.
+
+    Rows are checked with `CreateUserRequest`, passwords are hashed across a
+    process pool, and users are inserted `batch_size` at a time with
+    `INSERT ... ON CONFLICT DO NOTHING`. Every rejected row is reported.
+    Committing is left to the caller. Raises ValueError when the file has
+    more than `max_rows` rows.
+    """
+    started = time.perf_counter()
+    errors: list[UsersImportError] = []
+    valid: list[tuple[int, CreateUserRequest]] = []
+    seen_emails: set[str] = set()
+    total = 0
+
+    for row, fields in _parse_rows(content, import_format):
+        total += 1
+        if max_rows is not None and total > max_rows:
+            raise ValueError(ERROR_MESSAGE.IMPORT_TOO_LARGE)
+
+        if fields is None:
+            errors.append(
+                UsersImportError(row=row, reason=ERROR_MESSAGE.IMPORT_INVALID_ROW)
+            )
+            continue
+
+        try:
+            user_data = CreateUserRequest.model_validate(fields)
+        except ValidationError as validation_error:
+            errors.append(
+                UsersImportError(
+                    row=row,
+                    email=str(fields.get("email") or "") or None,
+                    reason=_validation_reason(validation_error),
+                )
+            )
+            continue
+
+        if user_data.email in seen_emails:
+            errors.append(
+                UsersImportError(
+                    row=row,
+                    email=user_data.email,
+                    reason=ERROR_MESSAGE.IMPORT_DUPLICATE_EMAIL,
+                )
+            )
+            continue
+
+        seen_emails.add(user_data.email)
+        valid.append((row, user_data))
+
+    hashed = await hash_passwords_in_processes(
+        [user_data.password for _, user_data in valid], max_workers=hash_workers
+    )
+
+    inserted = 0
+    for start in range(0, len(valid), batch_size):
+        batch = valid[start : start + batch_size]
+        created = await users_repo.bulk_insert_users(
+            users=[
+                dict(
+                    full_name=user_data.full_name,
+                    email=user_data.email,
+                    salt=salt,
+                    password=password_hash,
+                    role=USER_ROLES.USER,
+                )
+                for (_, user_data), (salt, password_hash) in zip(
+                    batch, hashed[start : start + batch_size]
+                )
+            ]
+        )
+        inserted += len(created)
+
+        created_emails = {row.email for row in created}
+        errors += [
+            UsersImportError(
+                row=row, email=user_data.email, reason=ERROR_MESSAGE.EMAIL_EXISTED
+            )
+            for row, user_data in batch
+            if user_data.email not in created_emails
+        ]
+
+    elapsed = time.perf_counter() - started
+    rows_per_sec = total / elapsed if elapsed else 0
+    logger.info(
+        "Imported %s of %s users in %.2fs (%.0f rows/s)",
+        inserted,
+        total,
+        elapsed,
+        rows_per_sec,
+    )
+
+    return UsersImportResponse(
+        total=total,
+        inserted=inserted,
+        failed=len(errors),
+        errors=sorted(errors, key=lambda error: error.row),
+        elapsed_sec=round(elapsed, 3),
+        rows_per_sec=round(rows_per_sec, 1),
+    )
@@ -1,89 +1,384 @@
-from sqlalchemy import and_, select
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from functools import lru_cache, partial
+from uuid import UUID
+
+from sqlalchemy import (
+    Row,
+    and_,
+    any_,
+    bindparam,
+    func,
+    lambda_stmt,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
 
+from src.apps.auth.token_cache import get_token_cache
 from src.apps.dependencies.database import db_error_handler
 from src.commons.constants.enum import USER_ROLES, USER_STATUS
+from src.commons.constants.message import ERROR_MESSAGE
+from src.commons.database.change_feed import USER_CHANGES_CHANNEL
 from src.commons.database.repositories.base import BaseRepository
+from src.commons.middlewares.exception import AppExceptionCase
 from src.commons.models.user_model import User
+from src.commons.stores.user_cache import get_user_cache
+from src.commons.utils.metrics import register_metrics
+from src.commons.utils.singleflight import SingleFlight
+from src.commons.utils.string import escape_like, normalize_email
 
 from .user_schema import CreateUserRequest, UpdateUserRequest
 
+USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.role,
+    User.status,
+    User.created_at,
+    User.updated_at,
+    User.version,
+)
+
+# Rendered inline rather than bound so the planner can match the partial
+# `ux_users_lower_email_active` index even for generic prepared plans.
+ACTIVE_STATUS = literal(USER_STATUS.ACTIVE, User.status.type, literal_execute=True)
+
+QUERY_CANCELED = "57014"
+
+# A single array parameter keeps the SQL text, and so the prepared
+# statement, the same however many ids are asked for.
+USERS_BY_IDS = select(User).where(
+    and_(
+        User.id == any_(bindparam("user_ids", type_=ARRAY(User.id.type))),
+        User.status == ACTIVE_STATUS,
+    )
+)
+
+
+@lru_cache
+def get_user_lookups() -> SingleFlight:
+    """Concurrent lookups of the same user in this process share one query."""
+    user_lookups = SingleFlight()
+    register_metrics("user_lookups", user_lookups.stats)
+
+    return user_lookups
+
 
 class UsersRepository(BaseRepository):
     def __init__(self, conn: AsyncConnection) -> None:
         super().__init__(conn)
 
     async def get_user_password_validation(self, *, user: User, password: str) -> bool:
-        user_password_checked = user.check_password(password=password)
+        user_password_checked = await user.check_password_async(password=password)
         return user_password_checked
 
     @db_error_handler
-    async def get_user_by_id(self, *, user_id: int) -> User:
-        query = (
-            select(User)
+    async def get_user_by_id(self, *, user_id: int, primary: bool = False) -> User:
+        user_cache = get_user_cache()
+        cache_key = user_cache.id_key(user_id)
+        # Cached and shared lookups may predate this request's own writes.
+        own_session = primary or self.in_transaction()
+        if not own_session:
+            hit, user = await user_cache.get(cache_key)
+            if hit:
+                return user
+
+        query = lambda_stmt(
+            lambda: select(User)
             .where(and_(User.id == user_id, User.status == USER_STATUS.ACTIVE))
             .limit(1)
         )
 
-        raw_result = await self.connection.execute(query)
-        result = raw_result.fetchone()
-
-        return result.User if result is not None else result
+        if own_session:
+            return await self._fetch_user(query, cache_key=cache_key, primary=primary)
+        return await get_user_lookups().do(
+            cache_key, lambda: self._lookup_user(query, cache_key=cache_key)
+        )
 
     @db_error_handler
-    async def get_user_by_email(self, *, email: str) -> User:
-        query = (
-            select(User)
-            .where(and_(User.email == email, User.status == USER_STATUS.ACTIVE))
+    async def get_user_by_email(self, *, email: str, primary: bool = False) -> User:
+        email = normalize_email(email)
+        user_cache = get_user_cache()
+        cache_key = user_cache.email_key(email)
+        # Cached and shared lookups may predate this request's own writes.
+        own_session = primary or self.in_transaction()
+        if not own_session:
+            hit, user = await user_cache.get(cache_key)
+            if hit:
+                return user
+
+        query = lambda_stmt(
+            lambda: select(User)
+            .where(and_(func.lower(User.email) == email, User.status == ACTIVE_STATUS))
             .limit(1)
         )
 
+        if own_session:
+            return await self._fetch_user(query, cache_key=cache_key, primary=primary)
+        return await get_user_lookups().do(
+            cache_key, lambda: self._lookup_user(query, cache_key=cache_key)
+        )
+
+    async def _lookup_user(
+        self, query: StatementLambdaElement, *, cache_key: str
+    ) -> User | None:
+        # Shared by every caller waiting on `cache_key`, so it runs on a
+        # session of its own: the first caller's may be closed or busy with
+        # another statement before the lookup finishes.
+        async with self.new_session() as session:
+            return await UsersRepository(session)._fetch_user(
+                query, cache_key=cache_key, primary=False
+            )
+
+    async def _fetch_user(
+        self, query: StatementLambdaElement, *, cache_key: str, primary: bool
+    ) -> User | None:
+        query = self.read_query(query, primary)
         raw_result = await self.connection.execute(query)
         result = raw_result.fetchone()
 
-        return result.User if result is not None else result
+        user = result.User if result is not None else None
+        # What this session wrote is not committed yet, so it stays uncached.
+        if not self.has_written():
+            await get_user_cache().set(
+                cache_key, user, shared=not self.reads_from_replica(query)
+            )
+        return user
+
+    @db_error_handler
+    async def get_users_by_ids(
+        self, *, user_ids: Sequence[UUID], primary: bool = False
+    ) -> list[User]:
+        """Active users among `user_ids`, in no particular order."""
+        user_cache = get_user_cache()
+        cache_keys = {user_id: user_cache.id_key(user_id) for user_id in user_ids}
+        cached = {}
+        if not primary:
+            cached = await user_cache.get_many(list(cache_keys.values()))
+
+        users = [user for user in cached.values() if user is not None]
+        missing_ids = [
+            user_id for user_id, key in cache_keys.items() if key not in cached
+        ]
+        if not missing_ids:
+            return users
+
+        query = self.read_query(USERS_BY_IDS, primary)
+        raw_results = await self.connection.execute(query, {"user_ids": missing_ids})
+        loaded = {user.id: user for user in raw_results.scalars().all()}
+        await user_cache.set_many(
+            {cache_keys[user_id]: loaded.get(user_id) for user_id in missing_ids},
+            shared=not self.reads_from_replica(query),
+        )
+
+        return users + list(loaded.values())
 
     @db_error_handler
     async def get_filtered_users(
         self,
         *,
-        skip: int = 0,
         limit: int = 100,
+        after: tuple[datetime, UUID] | None = None,
+        status: USER_STATUS | None = None,
+        role: USER_ROLES | None = None,
     ) -> list[User]:
-        query = select(User).offset(skip).limit(limit)
+        """Newest users first, keyset-paginated on (created_at, id)."""
+        query = lambda_stmt(lambda: select(User))
 
-        raw_results = await self.connection.execute(query)
+        if status is not None:
+            query += lambda query: query.where(User.status == status)
+        if role is not None:
+            query += lambda query: query.where(User.role == role)
+        if after is not None:
+            after_created_at, after_id = after
+            query += lambda query: query.where(
+                tuple_(User.created_at, User.id) < tuple_(after_created_at, after_id)
+            )
+
+        query += lambda query: query.order_by(
+            User.created_at.desc(), User.id.desc()
+        ).limit(limit)
+
+        raw_results = await self.connection.execute(self.read_query(query))
         results = raw_results.scalars().all()
         return results
 
+    @db_error_handler
+    async def search_users(
+        self, *, term: str, limit: int, timeout_ms: int
+    ) -> list[User]:
+        """
+        Users whose name or email contains `term`, most similar first.
+
+        Both the ILIKE filter and `similarity` are served by the pg_trgm GIN
+        indexes on `full_name` and `email`.
+        """
+        pattern = f"%{escape_like(term)}%"
+        rank = func.greatest(
+            func.similarity(User.full_name, term), func.similarity(User.email, term)
+        )
+        query = (
+            select(User)
+            .where(
+                or_(
+                    User.full_name.ilike(pattern, escape="/"),
+                    User.email.ilike(pattern, escape="/"),
+                )
+            )
+            .order_by(rank.desc(), User.id)
+            .limit(limit)
+        )
+
+        try:
+            raw_results = await self.execute_with_timeout(
+                self.read_query(query), timeout_ms=timeout_ms
+            )
+        except DBAPIError as db_error:
+            if getattr(db_error.orig, "pgcode", None) != QUERY_CANCELED:
+                raise
+            raise AppExceptionCase(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                context={"reason": ERROR_MESSAGE.SEARCH_TIMEOUT},
+            )
+
+        return raw_results.scalars().all()
+
+    async def stream_users(
+        self, *, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Every user as plain rows, fetched through a server-side cursor."""
+        query = (
+            select(*USER_COLUMNS)
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        raw_results = await self.connection.stream(query)
+        async for partition in raw_results.partitions():
+            yield partition
+
     @db_error_handler
     async def create_new_user(self, *, user_data: CreateUserRequest) -> User:
         created_user = User(**user_data.model_dump(exclude_none=True))
-        created_user.salt, created_user.password = User.hash_password(
+        created_user.salt, created_user.password = await User.hash_password_async(
             password=user_data.password
         )
         created_user.role = USER_ROLES.USER
         self.connection.add(created_user)
-        await self.connection.commit()
-        await self.connection.refresh(created_user)
+        await self.connection.flush()
+        await self._notify_user_change(user=created_user)
+        self.after_commit(
+            partial(
+                self._invalidate_caches,
+                created_user.id,
+                created_user.email,
+                created_user.version,
+            )
+        )
         return created_user
 
+    @staticmethod
+    async def _invalidate_caches(user_id: UUID, email: str, version: int) -> None:
+        get_token_cache().invalidate_user(user_id)
+        await get_user_cache().invalidate(user_id, email, version)
+
     @db_error_handler
-    async def update_user(self, *, id: str, user_data: UpdateUserRequest) -> User:
-        user = await self.get_user_by_id(user_id=id)
-        user.full_name = user_data.full_name
+    async def bulk_insert_users(self, *, users: list[dict]) -> list[Row]:
+        """
+        Insert many users in one statement, skipping emails that already exist.
 
-        self.connection.add(user)
-        await self.connection.commit()
-        await self.connection.refresh(user)
-        return user
+        Returns (id, email, version) of the rows actually inserted.
+        """
+        query = (
+            insert(User)
+            .values(users)
+            .on_conflict_do_nothing()
+            .returning(User.id, User.email, User.version)
+        )
+
+        raw_results = await self.connection.execute(query)
+        inserted = raw_results.all()
+
+        inserted_users = [(row.id, row.email, row.version) for row in inserted]
+        self.after_commit(partial(get_user_cache().invalidate_many, inserted_users))
+        return inserted
+
+    async def _notify_user_change(self, *, user: User | Row) -> None:
+        """Sent with the transaction, so listeners only hear about commits."""
+        payload = json.dumps(
+            {
+                "id": str(user.id),
+                "email": user.email,
+                "version": user.version,
+            }
+        )
+        await self.connection.execute(
+            select(func.pg_notify(USER_CHANGES_CHANNEL, payload))
+        )
+
+    async def _update_active_user(
+        self, *, id: str, expected_version: int | None = None, **values
+    ) -> Row | None:
+        """
+        One UPDATE ... RETURNING round trip, None when no active user matches.
+
+        With `expected_version` the row is only updated if nobody changed it
+        since that version was read.
+        """
+        conditions = [User.id == id, User.status == USER_STATUS.ACTIVE]
+        if expected_version is not None:
+            conditions.append(User.version == expected_version)
+
+        query = (
+            update(User)
+            .where(and_(*conditions))
+            .values(version=User.version + 1, **values)
+            .returning(*USER_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+
+        raw_result = await self.connection.execute(query)
+        result = raw_result.fetchone()
+        if result is not None:
+            await self._notify_user_change(user=result)
+            self.after_commit(
+                partial(
+                    self._invalidate_caches, result.id, result.email, result.version
+                )
+            )
+        return result
+
+    def get_cached_user_version(self, *, user_id: str) -> int | None:
+        """Version of the user if this process has it cached, without a query."""
+        user_cache = get_user_cache()
+        return user_cache.peek_version(user_cache.id_key(user_id))
 
     @db_error_handler
-    async def delete_user(self, *, id: str) -> User:
-        user = await self.get_user_by_id(user_id=id)
-        user.status = USER_STATUS.INACTIVE
+    async def update_user(
+        self,
+        *,
+        id: str,
+        user_data: UpdateUserRequest,
+        expected_version: int | None = None,
+    ) -> Row | None:
+        return await self._update_active_user(
+            id=id, expected_version=expected_version, full_name=user_data.full_name
+        )
 
-        self.connection.add(user)
-        await self.connection.commit()
-        await self.connection.refresh(user)
-        return user
+    @db_error_handler
+    async def delete_user(
+        self, *, id: str, expected_version: int | None = None
+    ) -> Row | None:
+        return await self._update_active_user(
+            id=id, expected_version=expected_version, status=USER_STATUS.INACTIVE
+        )
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, ConfigDict, EmailStr, UUID4
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, UUID4, field_validator
 
-from src.commons.constants.enum import USER_ROLES
+from src.commons.constants.enum import USER_ROLES, USER_STATUS
+from src.commons.dtos.response import DataResponse
+from src.commons.utils.string import normalize_email
 
 
 class CreateUserRequest(BaseModel):
@@ -8,14 +10,25 @@ class CreateUserRequest(BaseModel):
     password: str
     email: EmailStr
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str) -> str:
+        return normalize_email(email)
+
 
 class UpdateUserRequest(BaseModel):
     full_name: str
 
 
+class UsersBatchGetRequest(BaseModel):
+    ids: list[UUID4] = Field(min_length=1, max_length=500)
+
+
 class UsersFilters(BaseModel):
-    skip: int | None = 0
+    cursor: str | None = None
     limit: int | None = 100
+    status: USER_STATUS | None = None
+    role: USER_ROLES | None = None
 
 
 class UserResponse(BaseModel):
@@ -32,3 +45,36 @@ class UserResponse(BaseModel):
 
 class UserAuthResponse(UserResponse):
     token: str | None = None
+
+
+UserDataResponse = DataResponse[UserResponse]
+UserAuthDataResponse = DataResponse[UserAuthResponse]
+
+
+class UsersPageResponse(BaseModel):
+    data: list[UserResponse]
+    next_cursor: str | None = None
+
+
+class UsersBatchResponse(BaseModel):
+    data: list[UserResponse]
+    missing_ids: list[UUID4]
+
+
+class UsersSearchResponse(BaseModel):
+    data: list[UserResponse]
+
+
+class UsersImportError(BaseModel):
+    row: int
+    email: str | None = None
+    reason: str
+
+
+class UsersImportResponse(BaseModel):
+    total: int
+    inserted: int
+    failed: int
+    errors: list[UsersImportError]
+    elapsed_sec: float
+    rows_per_sec: float
@@ -1,19 +1,107 @@
+import csv
+import io
 import logging
+import time
+from collections.abc import AsyncIterator, Sequence
+from functools import partial
+from uuid import UUID
 
-from fastapi.encoders import jsonable_encoder
-from starlette.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+import orjson
+from sqlalchemy import Row
+from sqlalchemy.orm import sessionmaker
+from starlette.responses import Response
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_412_PRECONDITION_FAILED,
+)
 
+from src.apps.dependencies.loader import UserLoader
+from src.commons.configs.config import BaseSettings
+from src.commons.constants.enum import EXPORT_FORMAT, USER_ROLES, USER_STATUS
 from src.commons.constants.message import ERROR_MESSAGE
-from src.commons.middlewares.exception import response_4xx
+from src.commons.database.unit_of_work import UnitOfWork
+from src.commons.middlewares.exception import AppExceptionCase, response_4xx
 from src.commons.models.user_model import User
 from src.commons.services.base import BaseService
 from src.commons.services.service_result import ServiceResult, return_service
+from src.commons.stores.token_version import TokenVersionStore
+from src.commons.utils.cursor import decode_cursor, encode_cursor
+from src.commons.utils.etag import etag_matches, make_etag
 
+from . import user_import
 from .user_repository import UsersRepository
-from .user_schema import UpdateUserRequest, UserResponse, UsersFilters
+from .user_schema import (
+    UpdateUserRequest,
+    UserDataResponse,
+    UserResponse,
+    UsersBatchResponse,
+    UsersFilters,
+    UsersPageResponse,
+    UsersSearchResponse,
+)
 
 logger = logging.getLogger(__name__)
 
+EXPORT_COLUMNS = (
+    "id",
+    "email",
+    "full_name",
+    "role",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+
+def _user_etag(user_id: UUID | str, version: int) -> str:
+    return make_etag(UUID(str(user_id)).hex, version)
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def _update_failed(expected_version: int | None) -> AppExceptionCase:
+    """A conditional update that matched no row lost a race with another write."""
+    if expected_version is None:
+        return response_4xx(
+            status_code=HTTP_404_NOT_FOUND,
+            context={"reason": ERROR_MESSAGE.USER_NOT_FOUND},
+        )
+    return response_4xx(
+        status_code=HTTP_412_PRECONDITION_FAILED,
+        context={"reason": ERROR_MESSAGE.PRECONDITION_FAILED},
+    )
+
+
+def _encode_ndjson(rows: Sequence[Row]) -> bytes:
+    return b"".join(
+        orjson.dumps(row._asdict(), option=orjson.OPT_APPEND_NEWLINE) for row in rows
+    )
+
+
+def _encode_csv(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [
+            (
+                row.id,
+                row.email,
+                row.full_name,
+                row.role.value,
+                row.status.value,
+                row.created_at.isoformat() if row.created_at else "",
+                row.updated_at.isoformat() if row.updated_at else "",
+            )
+            for row in rows
+        ]
+    )
+    return buffer.getvalue().encode()
+
 
 class UsersService(BaseService):
     @return_service
@@ -21,7 +109,15 @@ class UsersService(BaseService):
         self,
         user_id: str,
         users_repo: UsersRepository,
+        if_none_match: str | None = None,
     ) -> ServiceResult:
+        if if_none_match:
+            cached_version = users_repo.get_cached_user_version(user_id=user_id)
+            if cached_version is not None:
+                etag = _user_etag(user_id, cached_version)
+                if etag_matches(if_none_match, etag):
+                    return _not_modified(etag)
+
         user = await users_repo.get_user_by_id(user_id=user_id)
         if not user:
             return response_4xx(
@@ -29,60 +125,269 @@ class UsersService(BaseService):
                 context={"reason": ERROR_MESSAGE.USER_NOT_FOUND},
             )
 
+        etag = _user_etag(user.id, user.version)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
         return dict(
             status_code=HTTP_200_OK,
-            content={
-                "data": jsonable_encoder(UserResponse.model_validate(user)),
-            },
+            content=UserDataResponse(data=UserResponse.model_validate(user)),
+            headers={"ETag": etag},
+        )
+
+    @return_service
+    async def get_users_by_ids(
+        self,
+        user_ids: list[UUID],
+        user_loader: UserLoader,
+    ) -> ServiceResult:
+        user_ids = list(dict.fromkeys(user_ids))
+        users = await user_loader.load_many(user_ids)
+
+        batch = UsersBatchResponse(
+            data=[UserResponse.model_validate(user) for user in users if user],
+            missing_ids=[
+                user_id for user_id, user in zip(user_ids, users) if user is None
+            ],
+        )
+
+        return dict(
+            status_code=HTTP_200_OK,
+            content=batch,
         )
 
     @return_service
     async def get_current_user(
         self,
         user: User,
+        if_none_match: str | None = None,
     ) -> ServiceResult:
+        etag = _user_etag(user.id, user.version)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
         return dict(
             status_code=HTTP_200_OK,
-            content={
-                "data": jsonable_encoder(UserResponse.model_validate(user)),
-            },
+            content=UserDataResponse(data=UserResponse.model_validate(user)),
+            headers={"ETag": etag},
         )
 
     def get_users_filters(
-        self, skip: int | None = 0, limit: int | None = 100
+        self,
+        cursor: str | None = None,
+        limit: int | None = 100,
+        status: USER_STATUS | None = None,
+        role: USER_ROLES | None = None,
     ) -> UsersFilters:
         return UsersFilters(
-            skip=skip,
+            cursor=cursor,
             limit=limit,
+            status=status,
+            role=role,
+        )
+
+    @return_service
+    async def get_users(
+        self,
+        filters: UsersFilters,
+        users_repo: UsersRepository,
+    ) -> ServiceResult:
+        try:
+            after = decode_cursor(filters.cursor) if filters.cursor else None
+        except ValueError:
+            return response_4xx(
+                status_code=HTTP_400_BAD_REQUEST,
+                context={"reason": ERROR_MESSAGE.INVALID_CURSOR},
+            )
+
+        users = await users_repo.get_filtered_users(
+            limit=filters.limit + 1,
+            after=after,
+            status=filters.status,
+            role=filters.role,
+        )
+
+        next_cursor = None
+        if len(users) > filters.limit:
+            users = users[: filters.limit]
+            next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+
+        page = UsersPageResponse(
+            data=[UserResponse.model_validate(user) for user in users],
+            next_cursor=next_cursor,
+        )
+
+        return dict(
+            status_code=HTTP_200_OK,
+            content=page,
+        )
+
+    @return_service
+    async def search_users(
+        self,
+        term: str,
+        limit: int,
+        timeout_ms: int,
+        users_repo: UsersRepository,
+    ) -> ServiceResult:
+        users = await users_repo.search_users(
+            term=term, limit=limit, timeout_ms=timeout_ms
+        )
+
+        results = UsersSearchResponse(
+            data=[UserResponse.model_validate(user) for user in users],
+        )
+
+        return dict(
+            status_code=HTTP_200_OK,
+            content=results,
         )
 
+    async def _expected_version(
+        self,
+        user_id: str,
+        if_match: str | None,
+        users_repo: UsersRepository,
+    ) -> int | AppExceptionCase | None:
+        """Version an If-Match header pins the update to, if one was sent."""
+        if if_match is None:
+            return None
+
+        current_user = await users_repo.get_user_by_id(user_id=user_id, primary=True)
+        if not current_user:
+            return response_4xx(
+                status_code=HTTP_404_NOT_FOUND,
+                context={"reason": ERROR_MESSAGE.USER_NOT_FOUND},
+            )
+
+        etag = _user_etag(current_user.id, current_user.version)
+        if not etag_matches(if_match, etag, weak=False):
+            return response_4xx(
+                status_code=HTTP_412_PRECONDITION_FAILED,
+                context={"reason": ERROR_MESSAGE.PRECONDITION_FAILED},
+            )
+
+        return current_user.version
+
     @return_service
     async def update_user(
         self,
         user_id: str,
         payload: UpdateUserRequest,
-        users_repo: UsersRepository,
+        unit_of_work: UnitOfWork,
+        if_match: str | None = None,
     ) -> UserResponse:
-        updated_user = await users_repo.update_user(id=user_id, user_data=payload)
+        users_repo = unit_of_work.repository(UsersRepository)
+        expected_version = await self._expected_version(
+            user_id=user_id, if_match=if_match, users_repo=users_repo
+        )
+        if isinstance(expected_version, AppExceptionCase):
+            return expected_version
+
+        updated_user = await users_repo.update_user(
+            id=user_id, user_data=payload, expected_version=expected_version
+        )
+        if not updated_user:
+            return _update_failed(expected_version)
 
         return dict(
             status_code=HTTP_200_OK,
-            content={
-                "data": jsonable_encoder(UserResponse.model_validate(updated_user)),
-            },
+            content=UserDataResponse(data=UserResponse.model_validate(updated_user)),
+            headers={"ETag": _user_etag(updated_user.id, updated_user.version)},
         )
 
     @return_service
     async def delete_user(
         self,
         user_id: str,
-        users_repo: UsersRepository,
+        unit_of_work: UnitOfWork,
+        token_versions: TokenVersionStore,
+        if_match: str | None = None,
     ) -> ServiceResult:
-        deleted_user = await users_repo.delete_user(id=user_id)
+        users_repo = unit_of_work.repository(UsersRepository)
+        expected_version = await self._expected_version(
+            user_id=user_id, if_match=if_match, users_repo=users_repo
+        )
+        if isinstance(expected_version, AppExceptionCase):
+            return expected_version
+
+        deleted_user = await users_repo.delete_user(
+            id=user_id, expected_version=expected_version
+        )
+        if not deleted_user:
+            return _update_failed(expected_version)
+
+        # Revoke before committing: if the bump fails the delete rolls back,
+        # and a bump for a delete that then fails to commit is harmless. The
+        # second bump after commit retires tokens issued by a signin that
+        # raced the delete.
+        await token_versions.bump(user_id=user_id)
+        unit_of_work.after_commit(partial(token_versions.bump, user_id=user_id))
 
         return dict(
             status_code=HTTP_200_OK,
-            content={
-                "data": jsonable_encoder(UserResponse.model_validate(deleted_user)),
-            },
+            content=UserDataResponse(data=UserResponse.model_validate(deleted_user)),
         )
+
+    @return_service
+    async def import_users(
+        self,
+        content: bytes,
+        import_format: EXPORT_FORMAT,
+        unit_of_work: UnitOfWork,
+        settings: BaseSettings,
+    ) -> ServiceResult:
+        try:
+            report = await user_import.import_users(
+                content=content,
+                import_format=import_format,
+                users_repo=unit_of_work.repository(UsersRepository),
+                batch_size=settings.import_batch_size,
+                hash_workers=settings.import_hash_workers,
+                max_rows=settings.import_max_rows,
+            )
+        except ValueError as import_error:
+            return response_4xx(
+                status_code=HTTP_400_BAD_REQUEST,
+                context={"reason": str(import_error)},
+            )
+
+        return dict(
+            status_code=HTTP_200_OK,
+            content=report,
+        )
+
+    async def export_users(
+        self,
+        session_factory: sessionmaker,
+        export_format: EXPORT_FORMAT,
+        batch_size: int,
+    ) -> AsyncIterator[bytes]:
+        """
+        Encode every user batch by batch so memory stays flat.
+
+        Runs inside the streaming response, after request dependencies are
+        closed, so it checks out its own session.
+        """
+        encode = _encode_csv if export_format == EXPORT_FORMAT.CSV else _encode_ndjson
+        exported_rows = 0
+        started = time.perf_counter()
+
+        try:
+            if export_format == EXPORT_FORMAT.CSV:
+                yield (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+
+            async with session_factory() as session:
+                users_repo = UsersRepository(session)
+                async for rows in users_repo.stream_users(batch_size=batch_size):
+                    exported_rows += len(rows)
+                    yield encode(rows)
+        finally:
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "Exported %s users as %s in %.2fs (%.0f rows/s)",
+                exported_rows,
+                export_format.value,
+                elapsed,
+                exported_rows / elapsed if elapsed else 0,
+            )
@@ -20,6 +20,7 @@ load_dotenv(env_file)
 class BaseSettings:
     app_env: ENV_TYPE = ENV_TYPE.DEV
     debug: bool = False
+    docs_enabled: bool = True
     docs_url: str = "/docs"
     openapi_prefix: str = ""
     openapi_url: str = "/openapi.json"
@@ -28,8 +29,19 @@ class BaseSettings:
     version: str = "0.0.0"
 
     database_url: PostgresDsn = f"postgresql+asyncpg://{os.getenv("POSTGRES_USER")}:{os.getenv("POSTGRES_PASSWORD")}@{os.getenv("POSTGRES_HOST")}/{os.getenv("POSTGRES_DB")}"
+    database_replica_urls: List[str] = [
+        url for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url
+    ]
+    database_replica_retry_sec: int = 30
     max_connection_count: int = 10
     min_connection_count: int = 10
+    database_echo: bool = False
+    database_pool_wait_warning_ms: int = 100
+    database_query_cache_size: int = 500
+    database_prepared_statement_cache_size: int = 500
+    change_feed_retry_sec: int = 5
+
+    redis_url: str | None = os.getenv("REDIS_URL")
 
     jwt_token_type = "Bearer"
     secret_key: SecretStr = os.getenv("SECRET_KEY")
@@ -38,10 +50,45 @@ class BaseSettings:
 
     jwt_expire_min: int = 15
 
+    token_cache_size: int = 1024
+    token_cache_ttl_sec: int = 60
+    auth_principal_mode: bool = False
+
+    user_cache_size: int = 10000
+    user_cache_local_ttl_sec: int = 60
+    user_cache_shared_ttl_sec: int = 300
+    user_cache_negative_ttl_sec: int = 5
+    user_cache_tombstone_ttl_sec: int = 30
+
+    password_pool_size: int = 4
+    password_pool_max_pending: int = 64
+
+    export_batch_size: int = 1000
+    import_batch_size: int = 1000
+    import_max_rows: int = 10000
+    import_hash_workers: int = os.cpu_count() or 1
+
+    user_search_timeout_ms: int = 200
+
+    idempotency_ttl_sec: int = 86400
+    idempotency_lock_ttl_sec: int = 30
+    idempotency_max_body_bytes: int = 65536
+
+    compression_minimum_size: int = 1024
+    static_max_age_sec: int = 31536000
+
     allowed_hosts: List[str] = ["*"]
 
     logging_level: int = logging.INFO
     loggers: Tuple[str, str] = ("uvicorn.asgi", "uvicorn.access")
+    # "text" for the formatted console and file sinks, "json" for batched
+    # JSON lines on stdout.
+    log_format: str = "text"
+    log_batch_size: int = 256
+    log_flush_interval_ms: int = 100
+    access_log_sample_rate: float = 1.0
+    # Path prefix -> sample rate, overriding `access_log_sample_rate`.
+    access_log_route_sample_rates: Dict[str, float] = {}
 
     s3_access_key: SecretStr = os.getenv("S3_ACCESS_KEY")
     s3_secret_key: SecretStr = os.getenv("S3_SECRET_KEY")
@@ -58,10 +105,11 @@ class BaseSettings:
     def fastapi_kwargs(self) -> Dict[str, Any]:
         return {
             "debug": self.debug,
-            "docs_url": self.docs_url,
+            # Docs are served prerendered by create_app, see `docs_enabled`.
+            "docs_url": None,
             "openapi_prefix": self.openapi_prefix,
-            "openapi_url": self.openapi_url,
-            "redoc_url": self.redoc_url,
+            "openapi_url": None,
+            "redoc_url": None,
             "title": self.title,
             "version": self.version,
         }
@@ -79,6 +127,7 @@ class DevSettings(BaseSettings):
     debug: bool = True
     title: str = "Dev FastAPI example application"
     logging_level: int = logging.DEBUG
+    database_echo: bool = True
 
 
 class QASettings(BaseSettings):
@@ -101,8 +150,15 @@ class UATSettings(BaseSettings):
 
 class ProdSettings(BaseSettings):
     debug: bool = False
+    docs_enabled: bool = False
     title: str = "FastAPI example application"
     logging_level: int = logging.INFO
+    log_format: str = "json"
+    access_log_sample_rate: float = 0.1
+    access_log_route_sample_rates: Dict[str, float] = {
+        "/static/": 0.01,
+        "/api/metrics": 0.01,
+    }
     jwt_expire_min: int = 60
 
 
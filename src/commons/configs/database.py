@@ -1,35 +1,105 @@
+import asyncio
 import logging
 
 from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from ..database.pool import InstrumentedQueuePool
+from ..database.repositories.base import SESSION_FACTORY
+from ..database.routing import ReplicaSet, RoutingSession
+from ..utils.metrics import register_metrics
 from .config import BaseSettings
 
 logger = logging.getLogger(__name__)
 
 
-async def connect_to_db(app: FastAPI, settings: BaseSettings) -> None:
-    logger.info("Connecting to database...")
-
+def _create_engine(url: str, settings: BaseSettings, **kwargs) -> AsyncEngine:
     engine = create_async_engine(
-        url=str(settings.database_url),
+        url=url,
+        poolclass=InstrumentedQueuePool,
         pool_size=settings.max_connection_count,
         max_overflow=0,
-        echo=True,
+        echo=settings.database_echo,
         future=True,
+        query_cache_size=settings.database_query_cache_size,
+        connect_args={
+            "prepared_statement_cache_size": (
+                settings.database_prepared_statement_cache_size
+            ),
+        },
+        **kwargs,
+    )
+    engine.pool.wait_warning_ms = settings.database_pool_wait_warning_ms
+    return engine
+
+
+async def _warm_up_pool(engine: AsyncEngine, size: int) -> None:
+    """Open `size` connections at once so first requests skip connect and TLS."""
+    connections = [engine.connect() for _ in range(size)]
+    results = await asyncio.gather(
+        *(connection.start() for connection in connections), return_exceptions=True
+    )
+    await asyncio.gather(
+        *(
+            connection.close()
+            for connection, result in zip(connections, results)
+            if not isinstance(result, BaseException)
+        )
+    )
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        logger.warning(
+            "Warmed up %s of %s connections for %s: %s",
+            size - len(errors),
+            size,
+            engine.url.render_as_string(hide_password=True),
+            errors[0],
+        )
+
+
+async def connect_to_db(app: FastAPI, settings: BaseSettings) -> None:
+    logger.info("Connecting to database...")
+
+    engine = _create_engine(str(settings.database_url), settings)
+    replicas = ReplicaSet(
+        engines=[
+            _create_engine(url, settings, pool_pre_ping=True)
+            for url in settings.database_replica_urls
+        ],
+        retry_after_sec=settings.database_replica_retry_sec,
     )
     async_session_factory = sessionmaker(
-        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=True
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replicas=replicas,
+        expire_on_commit=False,
+        autoflush=True,
     )
+    async_session_factory.configure(info={SESSION_FACTORY: async_session_factory})
+    app.state.engine = engine
+    app.state.replicas = replicas
     app.state.pool = async_session_factory
+    register_metrics("database_pool", lambda: engine.pool.stats())
+    register_metrics("database_replicas", replicas.stats)
+
+    warm_up_size = min(settings.min_connection_count, settings.max_connection_count)
+    await asyncio.gather(
+        *(
+            _warm_up_pool(pool_engine, warm_up_size)
+            for pool_engine in [engine, *replicas.engines]
+        )
+    )
 
-    logger.info("Connected to database.")
+    logger.info("Connected to database with %s read replica(s).", len(replicas.engines))
 
 
 async def close_db_connection(app: FastAPI) -> None:
     logger.info("Closing database connection...")
 
-    app.state.pool.close_all()
+    await app.state.engine.dispose()
+    await app.state.replicas.dispose()
 
     logger.info("Database connection closed.")
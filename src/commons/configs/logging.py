@@ -1,22 +1,48 @@
 import datetime
 import json
 import logging
+import random
 import sys
+import threading
+import traceback
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
+import orjson
 from asgi_correlation_id.context import correlation_id
 from loguru import logger
 
 from ..constants.constant import loglevel_mapping
 
+if TYPE_CHECKING:
+    from .config import BaseSettings
+
 
 class InterceptHandler(logging.Handler):
+    """
+    Forward stdlib records to loguru.
+
+    With `call_site` the frames are walked to attribute the record to the
+    function that logged it. Sinks that only need the logger name, like
+    the JSON one, skip the walk and get the name as `logger_name`.
+    """
+
+    def __init__(self, level: int = logging.NOTSET, call_site: bool = True) -> None:
+        super().__init__(level=level)
+        self.call_site = call_site
+
     def emit(self, record):
         try:
             level = logger.level(record.levelname).name
-        except AttributeError:
+        except (AttributeError, ValueError):
             level = loglevel_mapping[record.levelno]
 
+        if not self.call_site:
+            logger.bind(request_id="app", logger_name=record.name).opt(
+                exception=record.exc_info
+            ).log(level, record.getMessage())
+            return
+
         frame, depth = logging.currentframe(), 2
         while frame.f_code.co_filename == logging.__file__:
             frame = frame.f_back
@@ -26,9 +52,125 @@ class InterceptHandler(logging.Handler):
         log.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 
+class AccessLogSampler(logging.Filter):
+    """
+    Keep a sample of `uvicorn.access` records.
+
+    The rate comes from the longest prefix in `route_rates` matching the
+    request path, else `default_rate`. Error responses are always kept.
+    """
+
+    def __init__(self, default_rate: float, route_rates: dict[str, float]) -> None:
+        super().__init__()
+        self.default_rate = default_rate
+        self.route_rates = sorted(
+            route_rates.items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        try:
+            _, _, path, _, status_code = record.args
+        except (TypeError, ValueError):
+            return True
+        if status_code >= 400:
+            return True
+
+        rate = self.default_rate
+        for prefix, route_rate in self.route_rates:
+            if path.startswith(prefix):
+                rate = route_rate
+                break
+        return rate >= 1 or random.random() < rate
+
+
+def _json_record(record) -> dict:
+    extra = {
+        key: value
+        for key, value in record["extra"].items()
+        if value is not None and key != "request_id"
+    }
+    line = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": extra.pop("logger_name", record["name"]),
+        "message": record["message"],
+        "correlation_id": correlation_id.get(),
+    }
+    if extra:
+        line["extra"] = extra
+    if record["exception"] is not None:
+        line["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    return line
+
+
+class JsonLogWriter:
+    """
+    Loguru sink writing one compact JSON object per line, in batches.
+
+    Records are encoded on the logging thread and buffered; a background
+    thread writes the buffer in one call every `flush_interval_ms`, or as
+    soon as `batch_size` lines are waiting.
+    """
+
+    def __init__(
+        self, stream: BinaryIO, batch_size: int, flush_interval_ms: int
+    ) -> None:
+        self._stream = stream
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        self._lines: list[bytes] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="json-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message) -> None:
+        line = orjson.dumps(_json_record(message.record), default=str) + b"\n"
+        with self._lock:
+            self._lines.append(line)
+            pending = len(self._lines)
+        if pending >= self._batch_size:
+            self._wake.set()
+
+    def stop(self) -> None:
+        """Write what is still buffered; loguru calls it when the sink is removed."""
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self) -> None:
+        with self._lock:
+            lines, self._lines = self._lines, []
+        if lines:
+            self._stream.write(b"".join(lines))
+            self._stream.flush()
+
+
 class CustomizeLogger:
     @classmethod
-    def make_logger(cls, config_path: Path):
+    def make_logger(cls, config_path: Path, settings: "BaseSettings"):
+        access_log_sampler = AccessLogSampler(
+            default_rate=settings.access_log_sample_rate,
+            route_rates=settings.access_log_route_sample_rates,
+        )
+        if settings.log_format == "json":
+            return cls.customize_json_logging(
+                level=settings.logging_level,
+                batch_size=settings.log_batch_size,
+                flush_interval_ms=settings.log_flush_interval_ms,
+                access_log_sampler=access_log_sampler,
+            )
+
         config = cls.load_logging_config(config_path)
         logging_config = config.get("logger")
         log_filename = datetime.datetime.now().strftime("app_%Y-%m-%d.log")
@@ -39,6 +181,7 @@ class CustomizeLogger:
             retention=logging_config.get("retention"),
             rotation=logging_config.get("rotation"),
             format=logging_config.get("format"),
+            access_log_sampler=access_log_sampler,
         )
         return logger
 
@@ -50,6 +193,7 @@ class CustomizeLogger:
         rotation: str,
         retention: str,
         format: str,
+        access_log_sampler: AccessLogSampler | None = None,
     ):
         def correlation_id_filter(record):
             record["correlation_id"] = correlation_id.get()
@@ -75,17 +219,65 @@ class CustomizeLogger:
             filter=correlation_id_filter,
         )
 
+        cls.intercept_stdlib(call_site=True, access_log_sampler=access_log_sampler)
+
+        return logger.bind(request_id="app", method=None)
+
+    @classmethod
+    def customize_json_logging(
+        cls,
+        level: int,
+        batch_size: int,
+        flush_interval_ms: int,
+        access_log_sampler: AccessLogSampler | None = None,
+    ):
+        """
+        Compact JSON lines on stdout through a batched writer.
+
+        Nothing is formatted for the call site, so stdlib records skip
+        the frame walk.
+        """
+        logger.remove()
+        logger.add(
+            JsonLogWriter(
+                sys.stdout.buffer,
+                batch_size=batch_size,
+                flush_interval_ms=flush_interval_ms,
+            ),
+            level=level,
+            format="{message}",
+        )
+
+        cls.intercept_stdlib(call_site=False, access_log_sampler=access_log_sampler)
+
+        return logger.bind(request_id="app", method=None)
+
+    @classmethod
+    def intercept_stdlib(
+        cls,
+        call_site: bool,
+        access_log_sampler: AccessLogSampler | None = None,
+    ) -> None:
+        if not call_site:
+            # The optimization switches from the logging docs: no caller
+            # lookup, thread or process info on stdlib records either.
+            logging._srcfile = None
+            logging.logThreads = False
+            logging.logProcesses = False
+            logging.logMultiprocessing = False
+
         logging.getLogger("passlib").setLevel(logging.ERROR)
         logging.basicConfig(
-            handlers=[InterceptHandler()],
+            handlers=[InterceptHandler(call_site=call_site)],
             level=0,
+            force=True,
         )
-        logging.getLogger("uvicorn.access").handlers = [InterceptHandler()]
+        access_logger = logging.getLogger("uvicorn.access")
+        access_logger.handlers = [InterceptHandler(call_site=call_site)]
+        access_logger.filters = [access_log_sampler] if access_log_sampler else []
         for _log in ["uvicorn.error", "fastapi"]:
             _logger = logging.getLogger(_log)
-            _logger.handlers = [InterceptHandler()]
-
-        return logger.bind(request_id="app", method=None)
+            _logger.handlers = [InterceptHandler(call_site=call_site)]
 
     @classmethod
     def load_logging_config(cls, config_path):
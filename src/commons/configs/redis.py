@@ -0,0 +1,32 @@
+import logging
+
+from fastapi import FastAPI
+from redis.asyncio import Redis
+
+from .config import BaseSettings
+
+logger = logging.getLogger(__name__)
+
+
+async def connect_to_redis(app: FastAPI, settings: BaseSettings) -> None:
+    if not settings.redis_url:
+        logger.info("Redis is not configured, using in-memory stores.")
+        app.state.redis = None
+        return
+
+    logger.info("Connecting to redis...")
+
+    app.state.redis = Redis.from_url(settings.redis_url, decode_responses=True)
+
+    logger.info("Connected to redis.")
+
+
+async def close_redis_connection(app: FastAPI) -> None:
+    if app.state.redis is None:
+        return
+
+    logger.info("Closing redis connection...")
+
+    await app.state.redis.aclose()
+
+    logger.info("Redis connection closed.")
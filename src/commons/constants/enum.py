@@ -14,6 +14,11 @@ class USER_ROLES(Enum):
     USER: str = "USER"
 
 
+class EXPORT_FORMAT(Enum):
+    NDJSON: str = "ndjson"
+    CSV: str = "csv"
+
+
 class USER_STATUS(Enum):
     ACTIVE: str = "ACTIVE"
     INACTIVE: str = "INACTIVE"
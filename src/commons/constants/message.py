@@ -3,6 +3,7 @@ from enum import Enum
 
 class ERROR_MESSAGE(str, Enum):
     SERVER_ERROR = "Internal Server Error"
+    SERVER_BUSY = "Server is busy, please try again later"
     FORBIDDEN = "Forbidden"
     UNAUTHORIZED = "Unauthorized"
     INVALID_TOKEN_TYPE = "Invalid token type"
@@ -17,6 +18,14 @@ class ERROR_MESSAGE(str, Enum):
     EMAIL_EXISTED = "Email is already existed"
     INVALID_EMAIL_OR_PASSWORD = "Invalid email or password"
     USER_NOT_ACTIVE = "User is not active"
+    INVALID_CURSOR = "Invalid cursor"
+    PRECONDITION_FAILED = "User was modified by another request"
+    IDEMPOTENCY_IN_PROGRESS = "A request with this idempotency key is in progress"
+    IDEMPOTENCY_KEY_REUSED = "Idempotency key was used with a different request"
+    IMPORT_TOO_LARGE = "Import file has too many rows"
+    IMPORT_INVALID_ROW = "Row could not be parsed"
+    IMPORT_DUPLICATE_EMAIL = "Email appears more than once in the file"
+    SEARCH_TIMEOUT = "Search took too long, please refine the query"
 
 
 class SUCCESS_MESSAGE(str, Enum):
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from functools import lru_cache
+
+import asyncpg
+from sqlalchemy import make_url
+
+from ..configs.config import get_app_settings
+from ..utils.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+USER_CHANGES_CHANNEL = "user_changes"
+
+# Called with the decoded NOTIFY payload, or with None after the listener
+# reconnects, since events sent while it was down are lost.
+ChangeCallback = Callable[[dict | None], None]
+
+
+class ChangeFeed:
+    """
+    One LISTEN connection per process that fans NOTIFY events out to
+    in-process callbacks, so local caches drop entries another worker or
+    node has just changed.
+    """
+
+    def __init__(self, channels: tuple[str, ...], retry_after_sec: float) -> None:
+        self.channels = channels
+        self.retry_after_sec = retry_after_sec
+        self._callbacks: dict[str, list[ChangeCallback]] = defaultdict(list)
+        self._dsn: str | None = None
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopping = False
+        self.events = 0
+        self.reconnects = 0
+
+    def subscribe(self, channel: str, callback: ChangeCallback) -> None:
+        self._callbacks[channel].append(callback)
+
+    async def start(self, database_url: str) -> None:
+        self._dsn = (
+            make_url(database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._stopping = False
+
+        try:
+            await self._listen()
+        except (OSError, asyncpg.PostgresError) as listen_error:
+            logger.warning("Change feed is not listening yet: %s", listen_error)
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+        for channel in self.channels:
+            await connection.add_listener(channel, self._dispatch)
+        connection.add_termination_listener(self._on_terminated)
+        self._connection = connection
+        logger.info("Change feed listening on %s.", ", ".join(self.channels))
+
+    def _on_terminated(self, connection: asyncpg.Connection) -> None:
+        self._connection = None
+        if not self._stopping:
+            logger.warning("Change feed connection lost, reconnecting...")
+            self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.retry_after_sec)
+            try:
+                await self._listen()
+            except (OSError, asyncpg.PostgresError) as listen_error:
+                logger.warning("Change feed reconnect failed: %s", listen_error)
+                continue
+
+            self.reconnects += 1
+            for channel in self.channels:
+                self._notify(channel, None)
+            return
+
+    def _dispatch(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        self.events += 1
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload: %r", channel, payload)
+            return
+
+        self._notify(channel, event)
+
+    def _notify(self, channel: str, event: dict | None) -> None:
+        for callback in self._callbacks[channel]:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Change feed callback failed on %s.", channel)
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "listening": self._connection is not None,
+            "events": self.events,
+            "reconnects": self.reconnects,
+            "subscribers": sum(len(cbs) for cbs in self._callbacks.values()),
+        }
+
+
+@lru_cache
+def get_change_feed() -> ChangeFeed:
+    settings = get_app_settings()
+    change_feed = ChangeFeed(
+        channels=(USER_CHANGES_CHANNEL,),
+        retry_after_sec=settings.change_feed_retry_sec,
+    )
+    register_metrics("change_feed", change_feed.stats)
+
+    return change_feed
@@ -0,0 +1,55 @@
+"""Add users pg_trgm search indexes
+
+Revision ID: 0ecfd98189f1
+Revises: 90970e6dd1db
+Create Date: 2026-10-18 13:05:22.418630
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0ecfd98189f1"
+down_revision: Union[str, None] = "90970e6dd1db"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_full_name_trgm",
+            "users",
+            ["full_name"],
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_email_trgm",
+            "users",
+            ["email"],
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_email_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_users_full_name_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,30 @@
+"""Add users version column
+
+Revision ID: 5ea086112b28
+Revises: 0ecfd98189f1
+Create Date: 2026-10-18 14:22:48.091375
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5ea086112b28"
+down_revision: Union[str, None] = "0ecfd98189f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_column("users", "version")
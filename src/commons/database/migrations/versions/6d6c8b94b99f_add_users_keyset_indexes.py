@@ -0,0 +1,60 @@
+"""Add users keyset pagination indexes
+
+Revision ID: 6d6c8b94b99f
+Revises: 1e4075ebb338
+Create Date: 2026-10-18 09:12:41.204117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6d6c8b94b99f"
+down_revision: Union[str, None] = "1e4075ebb338"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_created_at_id",
+            "users",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_status_created_at_id",
+            "users",
+            ["status", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_role_created_at_id",
+            "users",
+            ["role", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_role_created_at_id",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_users_status_created_at_id",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_users_created_at_id",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
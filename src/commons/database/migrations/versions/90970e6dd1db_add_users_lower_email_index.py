@@ -0,0 +1,41 @@
+"""Add users lower(email) partial unique index
+
+Revision ID: 90970e6dd1db
+Revises: 6d6c8b94b99f
+Create Date: 2026-10-18 10:41:07.532904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "90970e6dd1db"
+down_revision: Union[str, None] = "6d6c8b94b99f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ux_users_lower_email_active",
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_where=sa.text("status = 'ACTIVE'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ux_users_lower_email_active",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,69 @@
+import logging
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from ..utils.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time and warns on slow checkouts."""
+
+    wait_warning_ms: float = 100
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = LatencyRecorder()
+        self.timeouts = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # Only a checkout from an exhausted pool waits; otherwise it takes an
+        # idle connection or opens one, and connect time is not a wait.
+        if not self._exhausted():
+            self.checkout_wait.observe(0)
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - started) * 1000
+            self.checkout_wait.observe(waited_ms)
+            if waited_ms > self.wait_warning_ms:
+                logger.warning(
+                    "event=slow_pool_checkout wait_ms=%.1f threshold_ms=%s "
+                    "size=%s checked_out=%s idle=%s",
+                    waited_ms,
+                    self.wait_warning_ms,
+                    self.size(),
+                    self.checkedout(),
+                    self.checkedin(),
+                )
+
+    def _exhausted(self) -> bool:
+        return (
+            self._pool.empty()
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.wait_warning_ms = self.wait_warning_ms
+        return pool
+
+    def stats(self) -> dict[str, int | dict]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "timeouts": self.timeouts,
+            "checkout_wait": self.checkout_wait.stats(),
+        }
@@ -1,4 +1,15 @@
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import Result, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from ..routing import REPLICA_OPTION, RoutingSession
+
+AFTER_COMMIT_HOOKS = "after_commit_hooks"
+# Set in the info of every session by the factory that made it.
+SESSION_FACTORY = "session_factory"
 
 
 class BaseRepository:
@@ -10,3 +21,68 @@ class BaseRepository:
     @property
     def connection(self) -> AsyncSession:
         return self._conn
+
+    def new_session(self) -> AsyncSession:
+        """
+        A separate session from the factory that made this one.
+
+        For work shared with other requests, which must not run on, or be
+        closed with, the caller's session.
+        """
+        return self._conn.info[SESSION_FACTORY]()
+
+    async def release(self) -> None:
+        """
+        Return the pooled connection as soon as the caller is done with it.
+
+        The session stays usable: it checks out a new connection lazily on
+        its next execute.
+        """
+        await self._conn.close()
+
+    def after_commit(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Run `hook` once the unit of work this repository belongs to commits."""
+        self._conn.info.setdefault(AFTER_COMMIT_HOOKS, []).append(hook)
+
+    def read_query(self, query: Executable, primary: bool = False) -> Executable:
+        """Route a read-only query to a replica unless `primary` is requested."""
+        if primary:
+            return query
+        if isinstance(query, StatementLambdaElement):
+            # Options set on a built lambda statement freeze the bound values
+            # of its first execution, so they go inside the lambda chain. The
+            # key is spelled out: lambdas track names they read as parameters.
+            return query + (lambda query: query.execution_options(use_replica=True))
+        return query.execution_options(**{REPLICA_OPTION: True})
+
+    def in_transaction(self) -> bool:
+        """
+        Whether this session has a transaction open or has written.
+
+        Its reads then have to run on it, to see what the request wrote.
+        """
+        return self._conn.sync_session.in_transaction() or self.has_written()
+
+    def has_written(self) -> bool:
+        """Whether this session has flushed or executed a write."""
+        session = self._conn.sync_session
+        return isinstance(session, RoutingSession) and session.pinned_to_primary
+
+    def reads_from_replica(self, query: Executable) -> bool:
+        """Whether `query` may be answered by a replica that lags the primary."""
+        session = self._conn.sync_session
+        return isinstance(session, RoutingSession) and session.routes_to_replica(query)
+
+    async def execute_with_timeout(self, query: Executable, timeout_ms: int) -> Result:
+        """
+        Execute `query` under a transaction-local `statement_timeout`.
+
+        Both statements are pinned to the bind chosen for `query`, so a
+        replica read runs on the connection the timeout was set on.
+        """
+        bind_arguments = {"bind": self._conn.get_bind(clause=query)}
+        await self._conn.execute(
+            select(func.set_config("statement_timeout", str(timeout_ms), True)),
+            bind_arguments=bind_arguments,
+        )
+        return await self._conn.execute(query, bind_arguments=bind_arguments)
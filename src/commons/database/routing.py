@@ -0,0 +1,113 @@
+import itertools
+import logging
+import time
+from functools import partial
+
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.base import Executable
+
+logger = logging.getLogger(__name__)
+
+REPLICA_OPTION = "use_replica"
+
+
+class ReplicaSet:
+    """Round-robin over read replicas, ejecting the ones that fail to connect."""
+
+    def __init__(self, engines: list[AsyncEngine], retry_after_sec: float) -> None:
+        self.engines = engines
+        self.retry_after_sec = retry_after_sec
+        self._counter = itertools.count()
+        self._ejected_until: dict[AsyncEngine, float] = {}
+        self._ejections: dict[AsyncEngine, int] = {engine: 0 for engine in engines}
+
+        for engine in engines:
+            event.listen(
+                engine.sync_engine, "handle_error", partial(self._on_error, engine)
+            )
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> AsyncEngine | None:
+        now = time.monotonic()
+        healthy = [
+            engine
+            for engine in self.engines
+            if self._ejected_until.get(engine, 0) <= now
+        ]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        self._ejected_until[engine] = time.monotonic() + self.retry_after_sec
+        self._ejections[engine] += 1
+        logger.warning(
+            "Ejected read replica %s for %ss",
+            engine.url.render_as_string(hide_password=True),
+            self.retry_after_sec,
+        )
+
+    def _on_error(self, engine: AsyncEngine, context: ExceptionContext) -> None:
+        if context.is_disconnect or isinstance(
+            context.sqlalchemy_exception, (OperationalError, InterfaceError)
+        ):
+            self.eject(engine)
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+    def stats(self) -> dict[str, dict[str, int | bool | dict]]:
+        now = time.monotonic()
+        return {
+            engine.url.render_as_string(hide_password=True): {
+                "healthy": self._ejected_until.get(engine, 0) <= now,
+                "ejections": self._ejections[engine],
+                "pool": engine.pool.stats(),
+            }
+            for engine in self.engines
+        }
+
+
+class RoutingSession(Session):
+    """
+    Sends statements marked with `REPLICA_OPTION` to a healthy replica.
+
+    Everything else goes to the primary, and once the session has written
+    anything it stays on the primary so the request reads its own writes.
+    """
+
+    def __init__(self, *args, replicas: ReplicaSet | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.pinned_to_primary = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+
+        if self._flushing or (clause is not None and clause.is_dml):
+            self.pinned_to_primary = True
+
+        if not self.routes_to_replica(clause):
+            return primary
+
+        replica = self.replicas.choose()
+        return replica.sync_engine if replica is not None else primary
+
+    def routes_to_replica(self, clause) -> bool:
+        """Whether `clause` would be sent to a replica rather than the primary."""
+        return bool(
+            self.replicas
+            and not self.pinned_to_primary
+            and isinstance(clause, Executable)
+            and clause.get_execution_options().get(REPLICA_OPTION)
+        )
@@ -0,0 +1,50 @@
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .repositories.base import AFTER_COMMIT_HOOKS, BaseRepository
+
+logger = logging.getLogger(__name__)
+
+Repository = TypeVar("Repository", bound=BaseRepository)
+
+
+class UnitOfWork:
+    """
+    One transaction shared by every repository a service call writes through.
+
+    Repositories only flush. `return_service` commits once when the service
+    succeeds, rolls back when it returns an error or raises, and then runs
+    the after-commit hooks the repositories queued.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._repositories: dict[type[BaseRepository], BaseRepository] = {}
+
+    def repository(self, repo_type: type[Repository]) -> Repository:
+        if repo_type not in self._repositories:
+            self._repositories[repo_type] = repo_type(self.session)
+        return self._repositories[repo_type]
+
+    def after_commit(self, hook: Callable[[], Awaitable[None]]) -> None:
+        self.session.info.setdefault(AFTER_COMMIT_HOOKS, []).append(hook)
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+        for hook in self.session.info.pop(AFTER_COMMIT_HOOKS, []):
+            try:
+                await hook()
+            except Exception:
+                logger.exception("After-commit hook failed.")
+
+    async def rollback(self) -> None:
+        self.session.info.pop(AFTER_COMMIT_HOOKS, None)
+        await self.session.rollback()
+
+    async def release(self) -> None:
+        self.session.info.pop(AFTER_COMMIT_HOOKS, None)
+        await self.session.close()
@@ -1,7 +1,9 @@
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel, ConfigDict
 
+T = TypeVar("T")
+
 
 class ErrorResponse(BaseModel):
     model_config = ConfigDict(
@@ -20,3 +22,9 @@ class ApiResponse(BaseModel):
     message: str = ""
     data: BaseModel
     detail: dict[str, Any] | None = {}
+
+
+class DataResponse(BaseModel, Generic[T]):
+    """`{"data": ...}` envelope, typed so pydantic-core serializes it in one pass."""
+
+    data: T
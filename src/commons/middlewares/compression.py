@@ -0,0 +1,83 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.compression import CODECS, Encoder, is_compressible, negotiate_encoding
+
+UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts.
+
+    A body sent in one message is compressed whole once it reaches
+    `minimum_size`. A streamed body is compressed chunk by chunk and
+    flushed after each one, so it still reaches the client as it is
+    produced. Responses that already carry a Content-Encoding, such as
+    precompressed static files, or whose type does not compress are
+    passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), CODECS
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder: Encoder | None = None
+
+        async def _send(message: Message) -> None:
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                headers = MutableHeaders(scope=start)
+                compressible = is_compressible(headers.get("content-type"))
+                vary = headers.get("vary", "").lower()
+                if compressible and "accept-encoding" not in vary:
+                    headers.add_vary_header("Accept-Encoding")
+
+                if (
+                    compressible
+                    and "content-encoding" not in headers
+                    and start["status"] not in UNCOMPRESSED_STATUSES
+                    and (more_body or len(body) >= self.minimum_size)
+                ):
+                    encoder = CODECS[encoding].encoder()
+                    headers["Content-Encoding"] = encoding
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        body = encoder.finish(body)
+                        headers["Content-Length"] = str(len(body))
+                        message = {**message, "body": body}
+                        encoder = None
+
+                await send(start)
+                start = None
+
+            if encoder is not None:
+                body = encoder.compress(body) if more_body else encoder.finish(body)
+                message = {**message, "body": body}
+            await send(message)
+
+        await self.app(scope, receive, _send)
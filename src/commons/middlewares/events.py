@@ -1,3 +1,4 @@
+import asyncio
 from typing import Callable
 
 from fastapi import FastAPI
@@ -5,6 +6,12 @@ from loguru import logger
 
 from ..configs.config import BaseSettings
 from ..configs.database import close_db_connection, connect_to_db
+from ..configs.redis import close_redis_connection, connect_to_redis
+from ..database.change_feed import get_change_feed
+from ..stores.idempotency import create_idempotency_store
+from ..stores.token_version import create_token_version_store
+from ..stores.user_cache import get_user_cache
+from ..utils.password import get_password_pool
 
 
 def create_start_app_handler(
@@ -12,7 +19,18 @@ def create_start_app_handler(
     settings: BaseSettings,
 ) -> Callable:
     async def start_app() -> None:
+        # Revocations in an in-memory store would only reach this process,
+        # so tokens revoked elsewhere would keep being accepted.
+        if settings.auth_principal_mode and not settings.redis_url:
+            raise RuntimeError("auth_principal_mode requires REDIS_URL to be set.")
+
         await connect_to_db(app, settings)
+        await connect_to_redis(app, settings)
+        app.state.token_versions = create_token_version_store(app.state.redis)
+        app.state.idempotency = create_idempotency_store(app.state.redis)
+        get_user_cache().redis = app.state.redis
+        await get_change_feed().start(str(settings.database_url))
+        await asyncio.to_thread(app.state.static_files.precompress)
 
     return start_app
 
@@ -20,6 +38,9 @@ def create_start_app_handler(
 def create_stop_app_handler(app: FastAPI) -> Callable:
     @logger.catch
     async def stop_app() -> None:
+        await get_change_feed().stop()
         await close_db_connection(app)
+        await close_redis_connection(app)
+        get_password_pool().shutdown()
 
     return stop_app
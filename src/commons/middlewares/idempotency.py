@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import logging
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..configs.config import get_app_settings
+from ..constants.message import ERROR_MESSAGE
+from ..stores.idempotency import IdempotencyStore, StoredResponse
+from .exception import app_exception_handler, response_4xx
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+IDEMPOTENT_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def _receive() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return _receive
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the first response to requests that repeat an `Idempotency-Key`.
+
+    Keys are scoped to the method, path and Authorization header, and a
+    duplicate whose body differs from the original is rejected. Responses
+    of 500 and above are not stored, so a failed request can be retried.
+    The reservation is extended while the request runs, so one that outlives
+    `idempotency_lock_ttl_sec` is not run again by a retry.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in IDEMPOTENT_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_app_settings()
+        store: IdempotencyStore = scope["app"].state.idempotency
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = hashlib.sha256(
+            "\n".join(
+                (
+                    scope["method"],
+                    scope["path"],
+                    headers.get("authorization", ""),
+                    idempotency_key,
+                )
+            ).encode()
+        ).hexdigest()
+
+        if not await store.reserve(key, ttl=settings.idempotency_lock_ttl_sec):
+            stored = await store.wait(key, timeout=settings.idempotency_lock_ttl_sec)
+            response = await self._replay(scope, stored, fingerprint)
+            await response(scope, receive, send)
+            return
+
+        started: Message = {}
+        chunks: list[bytes] = []
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                started.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        hold = asyncio.create_task(
+            self._hold(store, key, ttl=settings.idempotency_lock_ttl_sec)
+        )
+        try:
+            await self.app(scope, _replay_body(body, receive), _send)
+        except BaseException:
+            await store.release(key)
+            raise
+        finally:
+            hold.cancel()
+
+        content = b"".join(chunks)
+        status_code = started.get("status", 500)
+        if status_code >= 500 or len(content) > settings.idempotency_max_body_bytes:
+            await store.release(key)
+            return
+
+        stored = StoredResponse.build(
+            fingerprint=fingerprint,
+            status_code=status_code,
+            headers=[
+                (name.decode("latin-1"), value.decode("latin-1"))
+                for name, value in started.get("headers", [])
+            ],
+            body=content,
+        )
+        await store.complete(key, stored, ttl=settings.idempotency_ttl_sec)
+
+    @staticmethod
+    async def _hold(store: IdempotencyStore, key: str, ttl: float) -> None:
+        while True:
+            await asyncio.sleep(ttl / 3)
+            try:
+                if not await store.extend(key, ttl):
+                    return
+            except Exception:
+                logger.warning("Cannot extend idempotency reservation.", exc_info=True)
+
+    async def _replay(
+        self, scope: Scope, stored: StoredResponse | None, fingerprint: str
+    ) -> Response:
+        if stored is None:
+            return await app_exception_handler(
+                Request(scope),
+                response_4xx(
+                    status_code=HTTP_409_CONFLICT,
+                    context={"reason": ERROR_MESSAGE.IDEMPOTENCY_IN_PROGRESS},
+                ),
+            )
+        if stored.fingerprint != fingerprint:
+            return await app_exception_handler(
+                Request(scope),
+                response_4xx(
+                    status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                    context={"reason": ERROR_MESSAGE.IDEMPOTENCY_KEY_REUSED},
+                ),
+            )
+
+        response = Response(content=stored.content, status_code=stored.status_code)
+        response.raw_headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in stored.headers
+        ] + [(REPLAYED_HEADER.encode(), b"true")]
+        return response
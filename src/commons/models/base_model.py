@@ -14,8 +14,8 @@ class CustomBaseModel:
     __name__: str
 
     id = Column(UUID(), primary_key=True, default=uuid4)
-    created_at = Column(DateTime, default=utc_now)
-    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
+    updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
 
 
 CustomBaseModel = declarative_base(cls=CustomBaseModel)
@@ -1,12 +1,41 @@
-from sqlalchemy import Column, Enum, String
+from sqlalchemy import Column, Enum, Index, Integer, String, text
 
 from ..constants.enum import USER_ROLES, USER_STATUS
-from ..utils.password import generate_salt, get_password_hash, verify_password
+from ..utils.password import (
+    generate_salt,
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
 from .base_model import CustomBaseModel
 
 
 class User(CustomBaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+        Index(
+            "ux_users_lower_email_active",
+            text("lower(email)"),
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+        Index(
+            "ix_users_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
 
     email = Column(String(255), nullable=False, unique=True)
     full_name = Column(
@@ -25,6 +54,8 @@ class User(CustomBaseModel):
         nullable=False,
         default=USER_STATUS.ACTIVE,
     )
+    # Bumped on every update; backs ETags and If-Match checks.
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
 
     def __repr__(self):
         return f"<User email={self.email}, role={self.role}>"
@@ -36,3 +67,11 @@ class User(CustomBaseModel):
     def hash_password(cls, password: str) -> tuple[str, str]:
         salt = generate_salt()
         return salt, get_password_hash(salt + password)
+
+    async def check_password_async(self, password: str) -> bool:
+        return await verify_password_async(self.salt + password, self.password)
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> tuple[str, str]:
+        salt = generate_salt()
+        return salt, await get_password_hash_async(salt + password)
@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(ORJSONResponse):
+    """
+    JSON response that serializes its content exactly once.
+
+    Pydantic models go straight to bytes through pydantic-core, anything
+    else through orjson, so services can hand over typed models instead of
+    pre-encoded dicts.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
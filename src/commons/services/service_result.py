@@ -1,13 +1,17 @@
-import inspect
+import sys
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from loguru import logger
 
+from ..database.repositories.base import BaseRepository
+from ..database.unit_of_work import UnitOfWork
 from ..middlewares.exception import AppExceptionCase
+from .response import ModelResponse
 
 
 class ServiceResult:
-    def __init__(self, args):
+    def __init__(self, args, origin: str | None = None):
+        self.origin = origin
         if isinstance(args, AppExceptionCase):
             self.success = False
             self.exception_case = args.exception_case
@@ -17,7 +21,7 @@ class ServiceResult:
             self.success = True
             self.exception_case = None
             self.status_code = None
-            self.result = JSONResponse(**args)
+            self.result = args if isinstance(args, Response) else ModelResponse(**args)
 
     def __str__(self) -> str:
         if self.success:
@@ -36,24 +40,55 @@ class ServiceResult:
         pass
 
 
-def caller_info() -> str:
-    info = inspect.getframeinfo(inspect.stack()[2][0])
-    return f"{info.filename}:{info.function}:{info.lineno}"
+def caller_info(depth: int = 2) -> str:
+    """
+    `file:function:line` of the frame `depth` levels up.
+
+    Only reads the frame's code object, never the source file, so it is
+    cheap enough for every failed result.
+    """
+    frame = sys._getframe(depth)
+    return f"{frame.f_code.co_filename}:{frame.f_code.co_name}:{frame.f_lineno}"
 
 
 async def handle_result(result: ServiceResult):
     if not result.success:
         with result as exception:
-            logger.error(f"{exception} | caller={caller_info()}")
+            # Keyword arguments also land in the record's `extra`.
+            logger.error(
+                "event=service_error case={exception_case} "
+                "status_code={status_code} origin={origin} caller={caller} "
+                "context={context}",
+                exception_case=exception.exception_case,
+                status_code=exception.status_code,
+                origin=result.origin,
+                caller=caller_info(),
+                context=exception.context,
+            )
             raise exception
     with result as result:
         return result
 
 
 def return_service(service_func) -> ServiceResult:
-    async def wrapper(*args, **kwargs):
-        sf = await service_func(*args, **kwargs)
+    origin = f"{service_func.__module__}.{service_func.__qualname__}"
 
-        return ServiceResult(sf)
+    async def wrapper(*args, **kwargs):
+        units_of_work = [
+            value for value in kwargs.values() if isinstance(value, UnitOfWork)
+        ]
+        try:
+            sf = await service_func(*args, **kwargs)
+            for unit_of_work in units_of_work:
+                if isinstance(sf, AppExceptionCase):
+                    await unit_of_work.rollback()
+                else:
+                    await unit_of_work.commit()
+        finally:
+            for value in kwargs.values():
+                if isinstance(value, (BaseRepository, UnitOfWork)):
+                    await value.release()
+
+        return ServiceResult(sf, origin=origin)
 
     return wrapper
@@ -0,0 +1,175 @@
+import asyncio
+import base64
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+
+from redis.asyncio import Redis
+
+PENDING = "pending"
+
+# Pushes back the expiry of a reservation, but not of a stored response.
+EXTEND_PENDING = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: str  # base64
+
+    @classmethod
+    def build(
+        cls,
+        fingerprint: str,
+        status_code: int,
+        headers: list[tuple[str, str]],
+        body: bytes,
+    ) -> "StoredResponse":
+        return cls(
+            fingerprint=fingerprint,
+            status_code=status_code,
+            headers=headers,
+            body=base64.b64encode(body).decode(),
+        )
+
+    @property
+    def content(self) -> bytes:
+        return base64.b64decode(self.body)
+
+    def dumps(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def loads(cls, raw: str) -> "StoredResponse":
+        return cls(**json.loads(raw))
+
+
+class IdempotencyStore(ABC):
+    """
+    First response of each idempotency key, replayed to later duplicates.
+
+    A key is reserved while its first request runs; duplicates arriving in
+    the meantime wait for it to complete instead of running again.
+    """
+
+    poll_interval_sec = 0.05
+
+    @abstractmethod
+    async def reserve(self, key: str, ttl: float) -> bool:
+        """Claim `key`; False when another request already holds or completed it."""
+
+    @abstractmethod
+    async def get(self, key: str) -> StoredResponse | None: ...
+
+    @abstractmethod
+    async def complete(
+        self, key: str, response: StoredResponse, ttl: float
+    ) -> None: ...
+
+    @abstractmethod
+    async def extend(self, key: str, ttl: float) -> bool:
+        """Keep a reservation for another `ttl`; False once it is gone."""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Drop a reservation whose request failed, so a retry can run it."""
+
+    @abstractmethod
+    async def is_pending(self, key: str) -> bool: ...
+
+    async def wait(self, key: str, timeout: float) -> StoredResponse | None:
+        """The stored response once the in-flight request finishes, else None."""
+        deadline = time.monotonic() + timeout
+        while await self.is_pending(key) and time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval_sec)
+        return await self.get(key)
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float, StoredResponse | None]] = {}
+
+    def _entry(self, key: str) -> tuple[float, StoredResponse | None] | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    async def reserve(self, key: str, ttl: float) -> bool:
+        if self._entry(key) is not None:
+            return False
+        self._entries[key] = (time.monotonic() + ttl, None)
+        return True
+
+    async def get(self, key: str) -> StoredResponse | None:
+        entry = self._entry(key)
+        return entry[1] if entry is not None else None
+
+    async def complete(self, key: str, response: StoredResponse, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, response)
+
+    async def extend(self, key: str, ttl: float) -> bool:
+        if not await self.is_pending(key):
+            return False
+        self._entries[key] = (time.monotonic() + ttl, None)
+        return True
+
+    async def release(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def is_pending(self, key: str) -> bool:
+        entry = self._entry(key)
+        return entry is not None and entry[1] is None
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    key_prefix = "idempotency"
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+        self._extend_pending = redis.register_script(EXTEND_PENDING)
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    async def reserve(self, key: str, ttl: float) -> bool:
+        return bool(
+            await self._redis.set(self._key(key), PENDING, nx=True, ex=int(ttl))
+        )
+
+    async def get(self, key: str) -> StoredResponse | None:
+        raw = await self._redis.get(self._key(key))
+        if raw is None or raw == PENDING:
+            return None
+        return StoredResponse.loads(raw)
+
+    async def complete(self, key: str, response: StoredResponse, ttl: float) -> None:
+        await self._redis.set(self._key(key), response.dumps(), ex=int(ttl))
+
+    async def extend(self, key: str, ttl: float) -> bool:
+        return bool(
+            await self._extend_pending(
+                keys=[self._key(key)], args=[PENDING, int(ttl * 1000)]
+            )
+        )
+
+    async def release(self, key: str) -> None:
+        await self._redis.delete(self._key(key))
+
+    async def is_pending(self, key: str) -> bool:
+        return await self._redis.get(self._key(key)) == PENDING
+
+
+def create_idempotency_store(redis: Redis | None) -> IdempotencyStore:
+    if redis is None:
+        return InMemoryIdempotencyStore()
+    return RedisIdempotencyStore(redis)
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+
+from redis.asyncio import Redis
+
+
+class TokenVersionStore(ABC):
+    """
+    Per-user token version used to revoke tokens without a database lookup.
+
+    Tokens carry the version current at signin; bumping it invalidates every
+    token issued before.
+    """
+
+    @abstractmethod
+    async def get(self, user_id: str) -> int: ...
+
+    @abstractmethod
+    async def bump(self, user_id: str) -> int: ...
+
+
+class InMemoryTokenVersionStore(TokenVersionStore):
+    def __init__(self) -> None:
+        self._versions: dict[str, int] = {}
+
+    async def get(self, user_id: str) -> int:
+        return self._versions.get(str(user_id), 0)
+
+    async def bump(self, user_id: str) -> int:
+        version = self._versions.get(str(user_id), 0) + 1
+        self._versions[str(user_id)] = version
+        return version
+
+
+class RedisTokenVersionStore(TokenVersionStore):
+    key_prefix = "token_version"
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:{user_id}"
+
+    async def get(self, user_id: str) -> int:
+        version = await self._redis.get(self._key(user_id))
+        return int(version) if version is not None else 0
+
+    async def bump(self, user_id: str) -> int:
+        return await self._redis.incr(self._key(user_id))
+
+
+def create_token_version_store(redis: Redis | None) -> TokenVersionStore:
+    if redis is None:
+        return InMemoryTokenVersionStore()
+    return RedisTokenVersionStore(redis)
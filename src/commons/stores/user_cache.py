@@ -0,0 +1,309 @@
+import json
+import logging
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..configs.config import get_app_settings
+from ..database.change_feed import USER_CHANGES_CHANNEL, get_change_feed
+from ..constants.enum import USER_ROLES, USER_STATUS
+from ..models.user_model import User
+from ..utils.cache import TTLCache
+from ..utils.metrics import register_metrics
+from ..utils.string import normalize_email
+
+logger = logging.getLogger(__name__)
+
+NEGATIVE = "null"
+TOMBSTONE = "tombstone:"
+
+# Sets each KEYS[i] to ARGV[3i-2] for ARGV[3i] seconds unless the entry
+# already there is newer than version ARGV[3i-1]. Negatives count as
+# version 0 and tombstones carry the version of the write that left them.
+SET_IF_NEWER = """
+for index, key in ipairs(KEYS) do
+    local raw = ARGV[index * 3 - 2]
+    local version = tonumber(ARGV[index * 3 - 1])
+    local current = redis.call('GET', key)
+    local current_version = -1
+    if current == 'null' then
+        current_version = 0
+    elseif current and string.sub(current, 1, 10) == 'tombstone:' then
+        current_version = tonumber(string.sub(current, 11))
+    elseif current then
+        current_version = cjson.decode(current)['version']
+    end
+    if version >= current_version then
+        redis.call('SET', key, raw, 'EX', ARGV[index * 3])
+    end
+end
+"""
+
+
+def _dump_user(user: User) -> str:
+    return json.dumps(
+        {
+            "id": str(user.id),
+            "email": user.email,
+            "full_name": user.full_name,
+            "role": user.role.value,
+            "status": user.status.value,
+            "version": user.version,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+        }
+    )
+
+
+def _version(raw: str | None) -> int:
+    """Version an entry holds; -1 for none, 0 for a negative."""
+    if raw is None:
+        return -1
+    if raw == NEGATIVE:
+        return 0
+    if raw.startswith(TOMBSTONE):
+        return int(raw[len(TOMBSTONE) :])
+    return json.loads(raw)["version"]
+
+
+def _load_user(raw: str) -> User:
+    data = json.loads(raw)
+    user = User(
+        id=UUID(data["id"]),
+        email=data["email"],
+        full_name=data["full_name"],
+        # Credentials are never cached; they are read from the primary.
+        salt=None,
+        password=None,
+        role=USER_ROLES(data["role"]),
+        status=USER_STATUS(data["status"]),
+        version=data["version"],
+        created_at=(
+            datetime.fromisoformat(data["created_at"]) if data["created_at"] else None
+        ),
+        updated_at=(
+            datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None
+        ),
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+class UserCache:
+    """
+    Read-through cache of active users by id and by email.
+
+    An in-process LRU sits in front of a shared Redis tier. Every write
+    leaves a short-lived tombstone carrying its version in both tiers, and
+    the change feed leaves one in the local tier of other processes, so
+    they see the write without waiting for a TTL. Fills never replace a
+    newer entry or tombstone, so a read that started before the write
+    cannot put the old row back. Lookups that found no user are cached
+    too, under a shorter TTL. Salt and password hash are left out.
+    """
+
+    key_prefix = "user:v3"
+
+    def __init__(
+        self,
+        local_size: int,
+        local_ttl: float,
+        shared_ttl: float,
+        negative_ttl: float,
+        tombstone_ttl: float,
+        redis: Redis | None = None,
+    ) -> None:
+        self.local = TTLCache(maxsize=local_size, ttl=local_ttl)
+        self.shared_ttl = shared_ttl
+        self.negative_ttl = negative_ttl
+        self.tombstone_ttl = tombstone_ttl
+        self.redis = redis
+        self._set_if_newer = None
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    def peek_version(self, key: str) -> int | None:
+        """Version of a locally cached user, without building the model."""
+        raw = self.local.get(key)
+        if raw is None or raw == NEGATIVE or raw.startswith(TOMBSTONE):
+            return None
+        return json.loads(raw)["version"]
+
+    def id_key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:id:{user_id}"
+
+    def email_key(self, email: str) -> str:
+        return f"{self.key_prefix}:email:{normalize_email(email)}"
+
+    async def get(self, key: str) -> tuple[bool, User | None]:
+        """Return (hit, user); a hit with `None` is a cached negative lookup."""
+        raw = self.local.get(key)
+        if raw is None and self.redis is not None:
+            try:
+                raw = await self.redis.get(key)
+            except RedisError as redis_error:
+                self.shared_errors += 1
+                logger.warning("User cache read failed: %s", redis_error)
+            if raw is None or raw.startswith(TOMBSTONE):
+                self.shared_misses += 1
+            else:
+                self.shared_hits += 1
+                self._set_local(key, raw)
+
+        if raw is None or raw.startswith(TOMBSTONE):
+            return False, None
+        return True, None if raw == NEGATIVE else _load_user(raw)
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, User | None]:
+        """Cached entries among `keys`, fetching local misses with one MGET."""
+        found, missing = {}, []
+        for key in keys:
+            raw = self.local.get(key)
+            if raw is None:
+                missing.append(key)
+            elif not raw.startswith(TOMBSTONE):
+                found[key] = raw
+
+        if missing and self.redis is not None:
+            try:
+                values = await self.redis.mget(missing)
+            except RedisError as redis_error:
+                self.shared_errors += 1
+                logger.warning("User cache read failed: %s", redis_error)
+                values = [None] * len(missing)
+            for key, raw in zip(missing, values):
+                if raw is None or raw.startswith(TOMBSTONE):
+                    self.shared_misses += 1
+                    continue
+                self.shared_hits += 1
+                self._set_local(key, raw)
+                found[key] = raw
+
+        return {
+            key: None if raw == NEGATIVE else _load_user(raw)
+            for key, raw in found.items()
+        }
+
+    async def set(self, key: str, user: User | None, shared: bool = True) -> None:
+        await self.set_many({key: user}, shared=shared)
+
+    async def set_many(
+        self, users: dict[str, User | None], shared: bool = True
+    ) -> None:
+        """
+        Cache found users under both their keys, and misses as negatives.
+
+        Pass `shared=False` for rows read from a replica: they may lag the
+        primary, so they are only kept in this process, for the short
+        local TTL.
+        """
+        entries = {}
+        for key, user in users.items():
+            if user is None:
+                entries[key] = NEGATIVE
+                continue
+
+            raw = _dump_user(user)
+            entries[self.id_key(user.id)] = raw
+            entries[self.email_key(user.email)] = raw
+
+        for key, raw in entries.items():
+            self._set_local(key, raw)
+        if shared:
+            await self._set_shared(
+                {
+                    key: (raw, self._ttl(raw, self.shared_ttl))
+                    for key, raw in entries.items()
+                }
+            )
+
+    async def invalidate(self, user_id: str, email: str, version: int) -> None:
+        await self.invalidate_many([(user_id, email, version)])
+
+    async def invalidate_many(self, users: Sequence[tuple[str, str, int]]) -> None:
+        """
+        Leave tombstones for many (user_id, email, version) writes with one call.
+        """
+        tombstones = {}
+        for user_id, email, version in users:
+            raw = f"{TOMBSTONE}{version}"
+            tombstones[self.id_key(user_id)] = raw
+            tombstones[self.email_key(email)] = raw
+
+        for key, raw in tombstones.items():
+            self._set_local(key, raw)
+        await self._set_shared(
+            {key: (raw, self.tombstone_ttl) for key, raw in tombstones.items()}
+        )
+
+    def on_user_change(self, event: dict | None) -> None:
+        """Change feed callback; only this process' local tier is touched."""
+        if event is None:
+            self.local.clear()
+            return
+
+        raw = f"{TOMBSTONE}{event['version']}"
+        self._set_local(self.id_key(event["id"]), raw)
+        self._set_local(self.email_key(event["email"]), raw)
+
+    def _ttl(self, raw: str, ttl: float) -> float:
+        if raw == NEGATIVE:
+            return min(ttl, self.negative_ttl)
+        if raw.startswith(TOMBSTONE):
+            return min(ttl, self.tombstone_ttl)
+        return ttl
+
+    def _set_local(self, key: str, raw: str) -> None:
+        if _version(raw) >= _version(self.local.peek(key)):
+            self.local.set(key, raw, ttl=self._ttl(raw, self.local.ttl))
+
+    async def _set_shared(self, entries: dict[str, tuple[str, float]]) -> None:
+        if self.redis is None or not entries:
+            return
+
+        args = []
+        for raw, ttl in entries.values():
+            args += [raw, _version(raw), max(int(ttl), 1)]
+        if (
+            self._set_if_newer is None
+            or self._set_if_newer.registered_client is not self.redis
+        ):
+            self._set_if_newer = self.redis.register_script(SET_IF_NEWER)
+        try:
+            await self._set_if_newer(keys=list(entries), args=args)
+        except RedisError as redis_error:
+            self.shared_errors += 1
+            logger.warning("User cache write failed: %s", redis_error)
+
+    def stats(self) -> dict[str, int | float | dict]:
+        return {
+            "local": self.local.stats(),
+            "shared": {
+                "enabled": self.redis is not None,
+                "hits": self.shared_hits,
+                "misses": self.shared_misses,
+                "errors": self.shared_errors,
+            },
+        }
+
+
+@lru_cache
+def get_user_cache() -> UserCache:
+    settings = get_app_settings()
+    user_cache = UserCache(
+        local_size=settings.user_cache_size,
+        local_ttl=settings.user_cache_local_ttl_sec,
+        shared_ttl=settings.user_cache_shared_ttl_sec,
+        negative_ttl=settings.user_cache_negative_ttl_sec,
+        tombstone_ttl=settings.user_cache_tombstone_ttl_sec,
+    )
+    register_metrics("user_cache", user_cache.stats)
+    get_change_feed().subscribe(USER_CHANGES_CHANNEL, user_cache.on_user_change)
+
+    return user_cache
@@ -0,0 +1,128 @@
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Protocol
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class Encoder(Protocol):
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress `chunk` and flush, so the output so far can be decoded."""
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        """Compress the last `chunk` and end the stream."""
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        return self._compressor.process(chunk) + self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush()
+
+
+@dataclass(frozen=True)
+class Codec:
+    encoding: str
+    suffix: str
+    factory: Callable[[int], Encoder]
+    # Level for responses compressed per request, and for assets
+    # compressed once ahead of time.
+    level: int
+    best_level: int
+
+    def encoder(self, best: bool = False) -> Encoder:
+        return self.factory(self.best_level if best else self.level)
+
+
+# In order of preference when a client accepts several equally.
+CODECS: dict[str, Codec] = {
+    codec.encoding: codec
+    for codec in (
+        zstandard and Codec("zstd", ".zst", _ZstdEncoder, level=3, best_level=19),
+        brotli and Codec("br", ".br", _BrotliEncoder, level=4, best_level=11),
+        Codec("gzip", ".gz", _GzipEncoder, level=6, best_level=9),
+    )
+    if codec
+}
+
+
+def is_compressible(content_type: str | None) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate_encoding(accept_encoding: str | None, available) -> str | None:
+    """
+    Best encoding in `available` for an Accept-Encoding header, or None to
+    send the body as is.
+
+    Higher q-values win; ties go to the order of `available`.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
@@ -0,0 +1,22 @@
+import base64
+import json
+from datetime import datetime, timezone
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = datetime.fromisoformat(created_at)
+        if created_at.tzinfo is None:
+            # `created_at` is timestamptz, and asyncpg only binds aware values.
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at, UUID(id)
+    except (TypeError, ValueError) as decode_error:
+        raise ValueError("Invalid cursor") from decode_error
@@ -7,4 +7,4 @@ def convert_datetime_iso_format(dt: datetime) -> str:
 
 def utc_now():
     """Current UTC date and time with the microsecond value normalized to zero."""
-    return datetime.now()
+    return datetime.now(timezone.utc)
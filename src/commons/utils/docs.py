@@ -0,0 +1,79 @@
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from .compression import CODECS, negotiate_encoding
+from .etag import etag_matches, make_etag
+
+
+@dataclass(frozen=True)
+class Page:
+    body: bytes
+    media_type: str
+    digest: str
+    # Encoding -> the body compressed with it.
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+
+class DocsPages:
+    """
+    OpenAPI schema and docs pages rendered once and served from memory.
+
+    `render` fills the pages through `add`; it runs at startup, or on the
+    first request if startup was skipped. Each page is kept encoded and
+    precompressed, and answered with an ETag so a browser revalidates it
+    with a 304.
+    """
+
+    def __init__(
+        self, render: Callable[["DocsPages"], None], minimum_size: int = 1024
+    ) -> None:
+        self._render = render
+        self.minimum_size = minimum_size
+        self._pages: dict[str, Page] = {}
+
+    def render(self) -> None:
+        self._render(self)
+
+    def add(self, name: str, body: bytes | str, media_type: str) -> None:
+        if isinstance(body, str):
+            body = body.encode()
+        encoded = {}
+        if len(body) >= self.minimum_size:
+            encoded = {
+                encoding: codec.encoder(best=True).finish(body)
+                for encoding, codec in CODECS.items()
+            }
+        self._pages[name] = Page(
+            body=body,
+            media_type=media_type,
+            digest=hashlib.sha256(body).hexdigest()[:32],
+            encoded=encoded,
+        )
+
+    def response(self, name: str, request: Request) -> Response:
+        if name not in self._pages:
+            self.render()
+        page = self._pages[name]
+
+        encoding = negotiate_encoding(
+            request.headers.get("accept-encoding"), page.encoded
+        )
+        etag = make_etag(page.digest, encoding) if encoding else make_etag(page.digest)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if page.encoded:
+            headers["Vary"] = "Accept-Encoding"
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+        if encoding is None:
+            return Response(page.body, media_type=page.media_type, headers=headers)
+
+        headers["Content-Encoding"] = encoding
+        return Response(
+            page.encoded[encoding], media_type=page.media_type, headers=headers
+        )
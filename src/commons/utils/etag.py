@@ -0,0 +1,23 @@
+def make_etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = True) -> bool:
+    """
+    Whether an If-None-Match (weak) or If-Match (strong) header value
+    matches `etag`.
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,45 @@
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+_providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+class LatencyRecorder:
+    """Running latency summary with percentiles over the most recent samples."""
+
+    def __init__(self, window: int = 1024) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self._samples.append(elapsed_ms)
+
+    def percentile(self, percent: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p99_ms": round(self.percentile(99), 3),
+        }
+
+
+def register_metrics(name: str, provider: Callable[[], dict[str, Any]]) -> None:
+    _providers[name] = provider
+
+
+def collect_metrics() -> dict[str, dict[str, Any]]:
+    return {name: provider() for name, provider in _providers.items()}
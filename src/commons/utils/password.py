@@ -1,5 +1,20 @@
+import asyncio
+import math
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any
+
 import bcrypt
 from passlib.context import CryptContext
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from ..configs.config import get_app_settings
+from ..constants.message import ERROR_MESSAGE
+from ..middlewares.exception import AppExceptionCase
+from .metrics import LatencyRecorder, register_metrics
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -14,3 +29,118 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+class PasswordHasherPool:
+    """
+    Runs bcrypt work on dedicated threads so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so threads scale with cores. Calls
+    beyond `max_pending` are rejected with 503 instead of queueing up.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rejected = 0
+        self.latency = LatencyRecorder()
+        self._pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise AppExceptionCase(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                context={"reason": ERROR_MESSAGE.SERVER_BUSY},
+            )
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password"
+            )
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            self.latency.observe((time.perf_counter() - started) * 1000)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self.rejected,
+            **self.latency.stats(),
+        }
+
+
+@lru_cache
+def get_password_pool() -> PasswordHasherPool:
+    settings = get_app_settings()
+    password_pool = PasswordHasherPool(
+        max_workers=settings.password_pool_size,
+        max_pending=settings.password_pool_max_pending,
+    )
+    register_metrics("password_pool", password_pool.stats)
+
+    return password_pool
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await get_password_pool().run(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await get_password_pool().run(get_password_hash, password)
+
+
+def _salt_and_hash(passwords: list[str]) -> list[tuple[str, str]]:
+    hashed = []
+    for password in passwords:
+        salt = generate_salt()
+        hashed.append((salt, get_password_hash(salt + password)))
+    return hashed
+
+
+async def hash_passwords_in_processes(
+    passwords: list[str], max_workers: int
+) -> list[tuple[str, str]]:
+    """
+    (salt, hash) for every password, spread over a short-lived process pool.
+
+    Meant for bulk jobs such as user imports; request handlers keep using
+    the shared thread pool.
+    """
+    if not passwords:
+        return []
+
+    chunk_size = math.ceil(len(passwords) / max_workers)
+    chunks = [
+        passwords[start : start + chunk_size]
+        for start in range(0, len(passwords), chunk_size)
+    ]
+
+    loop = asyncio.get_running_loop()
+    executor = ProcessPoolExecutor(
+        max_workers=len(chunks), mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, _salt_and_hash, chunk) for chunk in chunks)
+        )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return [pair for chunk in results for pair in chunk]
@@ -0,0 +1,163 @@
+import logging
+import mimetypes
+import os
+import shutil
+import sys
+import tempfile
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .compression import CODECS, is_compressible, negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = tuple(codec.suffix for codec in CODECS.values())
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves compressed copies written ahead of time.
+
+    `precompress` writes a `.zst`, `.br` or `.gz` sibling for each asset
+    and indexes them; a request is then answered with the sibling its
+    Accept-Encoding prefers, as is. A request whose `v` query parameter is
+    the asset's current `version` is marked cacheable for `max_age_sec` and
+    immutable; any other request has to revalidate, so an unversioned URL
+    never pins stale content.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: str,
+        max_age_sec: int,
+        minimum_size: int = 1024,
+        **kwargs,
+    ) -> None:
+        super().__init__(directory=directory, **kwargs)
+        self.minimum_size = minimum_size
+        self.immutable_cache_control = f"public, max-age={max_age_sec}, immutable"
+        # Real path of an asset -> (its mtime, {encoding: (path, stat)}).
+        self._variants: dict[
+            str, tuple[float, dict[str, tuple[str, os.stat_result]]]
+        ] = {}
+
+    def precompress(self) -> None:
+        """
+        Write missing or stale compressed siblings and index them.
+
+        Cheap when the siblings are already current, so it runs on every
+        startup; run it at build time to keep the best-level compression
+        off the startup path. A read-only directory only costs the
+        precompressed copies: assets are then compressed per response.
+        """
+        variants = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(SUFFIXES):
+                    continue
+                path = os.path.realpath(os.path.join(root, name))
+                source = os.stat(path)
+                media_type, _ = mimetypes.guess_type(path)
+                if source.st_size < self.minimum_size or not is_compressible(
+                    media_type
+                ):
+                    continue
+
+                encoded = {}
+                for codec in CODECS.values():
+                    target = path + codec.suffix
+                    try:
+                        if _is_stale(target, source):
+                            _write_compressed(path, target, codec)
+                        encoded[codec.encoding] = (target, os.stat(target))
+                    except OSError as error:
+                        logger.warning("Cannot precompress %s: %s", target, error)
+                variants[path] = (source.st_mtime, encoded)
+        self._variants = variants
+
+    def version(self, path: str) -> str:
+        """Token that changes with the asset, for cache-busting its URL."""
+        full_path, stat_result = self.lookup_path(path)
+        if stat_result is None:
+            return ""
+        return _version(stat_result)
+
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        mtime, encoded = self._variants.get(full_path, (None, {}))
+        encoding = None
+        if mtime == stat_result.st_mtime:
+            encoding = negotiate_encoding(
+                request_headers.get("accept-encoding"), encoded
+            )
+
+        if encoding is None:
+            response = FileResponse(
+                full_path, status_code=status_code, stat_result=stat_result
+            )
+        else:
+            encoded_path, encoded_stat = encoded[encoding]
+            response = FileResponse(
+                encoded_path,
+                status_code=status_code,
+                stat_result=encoded_stat,
+                media_type=mimetypes.guess_type(full_path)[0],
+                headers={"Content-Encoding": encoding},
+            )
+        versioned = QueryParams(scope["query_string"]).get("v") == _version(stat_result)
+        response.headers["Cache-Control"] = (
+            self.immutable_cache_control if versioned else "no-cache"
+        )
+        if encoded:
+            response.headers.add_vary_header("Accept-Encoding")
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def _version(stat_result: os.stat_result) -> str:
+    return f"{int(stat_result.st_mtime)}-{stat_result.st_size}"
+
+
+def _is_stale(target: str, source: os.stat_result) -> bool:
+    try:
+        return os.stat(target).st_mtime < source.st_mtime
+    except FileNotFoundError:
+        return True
+
+
+def _write_compressed(path: str, target: str, codec) -> None:
+    with open(path, "rb") as source:
+        content = codec.encoder(best=True).finish(source.read())
+    # Every worker precompresses at startup: each writes its own temporary
+    # file, so none can truncate a file another is about to move in place.
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(target), suffix=".tmp", delete=False
+    ) as output:
+        output.write(content)
+    try:
+        # Temporary files are private to their owner; match the asset instead.
+        shutil.copymode(path, output.name)
+        os.replace(output.name, target)
+    except OSError:
+        os.unlink(output.name)
+        raise
+
+
+if __name__ == "__main__":
+    # python -m src.commons.utils.static_files src/static
+    logging.basicConfig(level=logging.INFO)
+    for directory in sys.argv[1:]:
+        PrecompressedStaticFiles(directory=directory, max_age_sec=0).precompress()
+        logger.info("Precompressed %s with %s", directory, ", ".join(CODECS))
@@ -3,3 +3,16 @@ def convert_field_to_camel_case(string: str) -> str:
         word if index == 0 else word.capitalize()
         for index, word in enumerate(string.split("_"))
     )
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def escape_like(value: str, escape: str = "/") -> str:
+    """Escape LIKE wildcards so `value` only matches literally."""
+    return (
+        value.replace(escape, escape * 2)
+        .replace("%", f"{escape}%")
+        .replace("_", f"{escape}_")
+    )
@@ -1,7 +1,8 @@
 from pathlib import Path
 
 from asgi_correlation_id import CorrelationIdMiddleware
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import (
@@ -9,7 +10,6 @@ from fastapi.openapi.docs import (
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
 )
-from starlette.staticfiles import StaticFiles
 
 from .apps import api_router
 
@@ -19,53 +19,103 @@ from .commons.middlewares.events import (
     create_stop_app_handler,
 )
 from .commons.configs.logging import CustomizeLogger
+from .commons.middlewares.compression import CompressionMiddleware
 from .commons.middlewares.exception import AppExceptionCase, app_exception_handler
+from .commons.middlewares.idempotency import IdempotencyMiddleware
 from .commons.middlewares.validation import (
     http_exception_handler,
     request_validation_exception_handler,
 )
+from .commons.services.response import ModelResponse
+from .commons.utils.docs import DocsPages
+from .commons.utils.static_files import PrecompressedStaticFiles
 
 config_path = Path(__file__).with_name("logging_conf.json")
 settings = get_app_settings()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(**settings.fastapi_kwargs)
+    app = FastAPI(**settings.fastapi_kwargs, default_response_class=ModelResponse)
 
+    # Innermost, so replayed responses still pass through CORS.
+    app.add_middleware(IdempotencyMiddleware)
+    # Outside idempotency, so stored responses stay uncompressed and a
+    # replay is encoded for the client that repeats the request.
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.compression_minimum_size
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.allowed_hosts,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],
     )
 
     app.add_middleware(CorrelationIdMiddleware)
-    app.logger = CustomizeLogger.make_logger(config_path)
+    app.logger = CustomizeLogger.make_logger(config_path, settings)
     app.include_router(api_router, prefix=settings.api_prefix)
-    app.mount("/static", StaticFiles(directory="src/static"))
-
-    @app.get("/docs", include_in_schema=False)
-    async def custom_swagger_ui_html():
-        return get_swagger_ui_html(
-            openapi_url=app.openapi_url,
-            title=app.title + " - Swagger UI custom",
-            oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
-            swagger_js_url=f"{settings.openapi_prefix}/static/swagger-ui-bundle.js",
-            swagger_css_url=f"{settings.openapi_prefix}/static/swagger-ui.css",
+    static_files = PrecompressedStaticFiles(
+        directory="src/static",
+        max_age_sec=settings.static_max_age_sec,
+        minimum_size=settings.compression_minimum_size,
+    )
+    app.state.static_files = static_files
+    app.mount("/static", static_files)
+
+    def static_url(path: str) -> str:
+        return f"{settings.openapi_prefix}/static/{path}?v={static_files.version(path)}"
+
+    def render_docs(pages: DocsPages) -> None:
+        pages.add("openapi", orjson.dumps(app.openapi()), "application/json")
+        pages.add(
+            "swagger",
+            get_swagger_ui_html(
+                openapi_url=settings.openapi_url,
+                title=app.title + " - Swagger UI custom",
+                oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
+                swagger_js_url=static_url("swagger-ui-bundle.js"),
+                swagger_css_url=static_url("swagger-ui.css"),
+            ).body,
+            "text/html",
+        )
+        pages.add(
+            "oauth2_redirect", get_swagger_ui_oauth2_redirect_html().body, "text/html"
+        )
+        pages.add(
+            "redoc",
+            get_redoc_html(
+                openapi_url=settings.openapi_url,
+                title=app.title + " - ReDoc",
+                redoc_js_url=static_url("redoc.standalone.js"),
+            ).body,
+            "text/html",
         )
 
-    @app.get(app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
-    async def swagger_ui_redirect():
-        return get_swagger_ui_oauth2_redirect_html()
-
-    @app.get("/redoc", include_in_schema=False)
-    async def redoc_html():
-        return get_redoc_html(
-            openapi_url=app.openapi_url,
-            title=app.title + " - ReDoc",
-            redoc_js_url=f"{settings.openapi_prefix}/static/redoc.standalone.js",
+    if settings.docs_enabled:
+        docs_pages = DocsPages(
+            render_docs,
+            minimum_size=settings.compression_minimum_size,
         )
+        app.state.docs_pages = docs_pages
+        app.add_event_handler("startup", docs_pages.render)
+
+        @app.get(settings.openapi_url, include_in_schema=False)
+        async def openapi_json(request: Request):
+            return docs_pages.response("openapi", request)
+
+        @app.get(settings.docs_url, include_in_schema=False)
+        async def custom_swagger_ui_html(request: Request):
+            return docs_pages.response("swagger", request)
+
+        @app.get(app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
+        async def swagger_ui_redirect(request: Request):
+            return docs_pages.response("oauth2_redirect", request)
+
+        @app.get(settings.redoc_url, include_in_schema=False)
+        async def redoc_html(request: Request):
+            return docs_pages.response("redoc", request)
 
     @app.exception_handler(HTTPException)
     async def custom_http_exception_handler(request, e):
@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("APP_ENV", "dev")
+os.environ.setdefault("SECRET_KEY", "secret")
+
+from src.commons.database.repositories.base import SESSION_FACTORY  # noqa: E402
+from src.commons.models.base_model import CustomBaseModel  # noqa: E402
+from src.commons.stores.user_cache import get_user_cache  # noqa: E402
+
+
+class SyncSession:
+    """
+    Just enough of `AsyncSession` for repositories, over a sync SQLite session.
+
+    Lets repository code run through the real statements without Postgres.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.sync_session = session
+        self.info = session.info
+
+    async def execute(self, *args, **kwargs):
+        return self.session.execute(*args, **kwargs)
+
+    async def flush(self) -> None:
+        self.session.flush()
+
+    async def commit(self) -> None:
+        self.session.commit()
+
+    async def rollback(self) -> None:
+        self.session.rollback()
+
+    def add(self, instance) -> None:
+        self.session.add(instance)
+
+    async def close(self) -> None:
+        self.session.close()
+
+    async def __aenter__(self) -> "SyncSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+@pytest.fixture
+def session(tmp_path):
+    # A file, so sessions opened from the factory get their own connection
+    # and only see what the others committed.
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    # Repositories announce user changes with pg_notify; SQLite has no
+    # listeners, so it only has to exist.
+    event.listen(
+        engine,
+        "connect",
+        lambda connection, _: connection.create_function(
+            "pg_notify", 2, lambda channel, payload: None
+        ),
+    )
+    CustomBaseModel.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.info[SESSION_FACTORY] = lambda: SyncSession(
+            Session(engine, expire_on_commit=False)
+        )
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    get_user_cache().local.clear()
+    yield
+    get_user_cache().local.clear()
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
@@ -0,0 +1,19 @@
+import pytest
+from fastapi import FastAPI
+
+from src.commons.configs.config import DevSettings
+from src.commons.middlewares.events import create_start_app_handler
+
+from .conftest import run
+
+
+class PrincipalModeSettings(DevSettings):
+    auth_principal_mode = True
+    redis_url = None
+
+
+def test_principal_mode_without_redis_fails_startup():
+    start_app = create_start_app_handler(FastAPI(), PrincipalModeSettings())
+
+    with pytest.raises(RuntimeError, match="REDIS_URL"):
+        run(start_app())
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+from starlette.responses import JSONResponse
+
+from src.commons.configs.config import get_app_settings
+from src.commons.middlewares.idempotency import IdempotencyMiddleware
+from src.commons.stores.idempotency import InMemoryIdempotencyStore
+
+from .conftest import run
+
+
+def request_scope(store) -> dict:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/users/import",
+        "headers": [(b"idempotency-key", b"import-1")],
+        "app": SimpleNamespace(state=SimpleNamespace(idempotency=store)),
+    }
+
+
+async def send_request(middleware, store) -> list[dict]:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"rows", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(request_scope(store), receive, send)
+    return sent
+
+
+def test_retry_does_not_rerun_a_request_that_outlives_the_lock(monkeypatch):
+    monkeypatch.setattr(get_app_settings(), "idempotency_lock_ttl_sec", 0.05)
+    store = InMemoryIdempotencyStore()
+    store.poll_interval_sec = 0.01
+    runs = 0
+
+    async def slow_import(scope, receive, send):
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.2)
+        await JSONResponse({"imported": 1}, status_code=201)(scope, receive, send)
+
+    middleware = IdempotencyMiddleware(slow_import)
+
+    async def first_and_retry():
+        first = asyncio.create_task(send_request(middleware, store))
+        # Well past the lock TTL, while the first request is still running.
+        await asyncio.sleep(0.12)
+        retry = await send_request(middleware, store)
+        return await first, retry
+
+    first, retry = run(first_and_retry())
+    assert runs == 1
+    assert first[0]["status"] == 201
+    assert retry[0]["status"] in (201, 409)
+
+
+def test_extend_keeps_only_reservations():
+    store = InMemoryIdempotencyStore()
+
+    async def extends():
+        missing = await store.extend("key", ttl=60)
+        await store.reserve("key", ttl=60)
+        reserved = await store.extend("key", ttl=60)
+        await store.release("key")
+        return missing, reserved, await store.extend("key", ttl=60)
+
+    assert run(extends()) == (False, True, False)
@@ -0,0 +1,36 @@
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from src.commons.database.pool import InstrumentedQueuePool
+
+from .conftest import run
+
+
+def slow_connect():
+    time.sleep(0.05)
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_connect_time_is_not_a_checkout_wait():
+    pool = InstrumentedQueuePool(slow_connect, pool_size=1, max_overflow=0)
+
+    pool.connect()
+    assert pool.checkout_wait.max_ms == 0
+
+
+def test_exhausted_pool_records_the_wait():
+    pool = InstrumentedQueuePool(
+        slow_connect, pool_size=1, max_overflow=0, timeout=0.05
+    )
+    connection = pool.connect()
+
+    # The async pool only waits inside a greenlet, as it does under asyncpg.
+    with pytest.raises(PoolTimeoutError):
+        run(greenlet_spawn(pool.connect))
+    assert pool.timeouts == 1
+    assert pool.checkout_wait.max_ms >= 50
+    connection.close()
@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.exc import OperationalError
+
+from src.commons.constants.enum import USER_ROLES, USER_STATUS
+from src.commons.database import routing
+from src.commons.database.routing import ReplicaSet, RoutingSession
+from src.commons.models.base_model import CustomBaseModel
+from src.commons.models.user_model import User
+
+
+class StandInEngine:
+    """The parts of an `AsyncEngine` a `ReplicaSet` uses, over sync SQLite."""
+
+    def __init__(self, url: str) -> None:
+        self.sync_engine = create_engine(url)
+        self.url = self.sync_engine.url
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(routing.time, "monotonic", clock)
+    return clock
+
+
+def replica_read():
+    return select(User).execution_options(use_replica=True)
+
+
+def test_choose_round_robins_over_replicas(tmp_path):
+    engines = [StandInEngine(f"sqlite:///{tmp_path / f'{n}.db'}") for n in range(3)]
+    replicas = ReplicaSet(engines=engines, retry_after_sec=30)
+
+    assert [replicas.choose() for _ in range(6)] == engines * 2
+
+
+def test_failing_replica_is_ejected_then_readmitted(tmp_path, clock):
+    healthy = StandInEngine(f"sqlite:///{tmp_path / 'healthy.db'}")
+    failing = StandInEngine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = ReplicaSet(engines=[healthy, failing], retry_after_sec=30)
+
+    # Goes through the engine's handle_error listener, as a refused
+    # connection to a replica does.
+    with pytest.raises(OperationalError):
+        failing.sync_engine.connect()
+
+    assert {replicas.choose() for _ in range(4)} == {healthy}
+
+    clock.now += 30
+    assert {replicas.choose() for _ in range(4)} == {healthy, failing}
+
+
+def test_no_healthy_replica_reads_from_primary(tmp_path, clock):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = StandInEngine(f"sqlite:///{tmp_path / 'replica.db'}")
+    replicas = ReplicaSet(engines=[replica], retry_after_sec=30)
+    replicas.eject(replica)
+
+    session = RoutingSession(bind=primary, replicas=replicas)
+    assert session.get_bind(clause=replica_read()) is primary
+
+
+def test_session_stays_on_primary_after_dml(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = StandInEngine(f"sqlite:///{tmp_path / 'replica.db'}")
+    session = RoutingSession(
+        bind=primary, replicas=ReplicaSet(engines=[replica], retry_after_sec=30)
+    )
+
+    assert session.get_bind(clause=replica_read()) is replica.sync_engine
+    assert session.get_bind(clause=select(User)) is primary
+
+    session.get_bind(clause=update(User).values(full_name="A"))
+    assert session.get_bind(clause=replica_read()) is primary
+
+
+def test_session_stays_on_primary_after_flush(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    CustomBaseModel.metadata.create_all(primary)
+    replica = StandInEngine(f"sqlite:///{tmp_path / 'replica.db'}")
+    session = RoutingSession(
+        bind=primary, replicas=ReplicaSet(engines=[replica], retry_after_sec=30)
+    )
+    session.add(
+        User(
+            email="a@x.com",
+            full_name="A",
+            salt="salt",
+            password="password",
+            role=USER_ROLES.USER,
+            status=USER_STATUS.ACTIVE,
+        )
+    )
+    session.flush()
+
+    assert session.pinned_to_primary
+    assert session.get_bind(clause=replica_read()) is primary
+    session.close()
@@ -0,0 +1,40 @@
+import gzip
+import os
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from src.commons.utils.static_files import PrecompressedStaticFiles
+
+
+def test_only_versioned_urls_are_immutable(tmp_path):
+    (tmp_path / "app.css").write_text("body{}" * 500)
+    static_files = PrecompressedStaticFiles(directory=tmp_path, max_age_sec=60)
+    static_files.precompress()
+    client = TestClient(Starlette(routes=[Mount("/static", static_files)]))
+
+    version = static_files.version("app.css")
+    cache_control = {
+        query: client.get(f"/static/app.css{query}").headers["cache-control"]
+        for query in ("", f"?v={version}", "?v=stale")
+    }
+    assert cache_control == {
+        "": "no-cache",
+        f"?v={version}": "public, max-age=60, immutable",
+        "?v=stale": "no-cache",
+    }
+
+
+def test_precompress_replaces_stale_siblings_whole(tmp_path):
+    asset = tmp_path / "app.css"
+    asset.write_text("body{}" * 500)
+    stale = tmp_path / "app.css.gz"
+    stale.write_bytes(b"truncated")
+    os.utime(stale, (0, 0))
+
+    PrecompressedStaticFiles(directory=tmp_path, max_age_sec=60).precompress()
+
+    assert gzip.decompress(stale.read_bytes()) == asset.read_bytes()
+    assert stale.stat().st_mode == asset.stat().st_mode
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,156 @@
+import json
+from uuid import uuid4
+
+import fakeredis
+
+from src.commons.constants.enum import USER_ROLES, USER_STATUS
+from src.commons.models.user_model import User
+from src.commons.stores.user_cache import TOMBSTONE, UserCache
+
+from .conftest import run
+
+USER_ID = uuid4()
+
+
+def make_user(version: int, status: USER_STATUS = USER_STATUS.ACTIVE) -> User:
+    return User(
+        id=USER_ID,
+        email="a@x.com",
+        full_name="A",
+        salt="salt",
+        password="password",
+        role=USER_ROLES.USER,
+        status=status,
+        version=version,
+    )
+
+
+def make_cache() -> UserCache:
+    return UserCache(
+        local_size=10, local_ttl=60, shared_ttl=300, negative_ttl=5, tombstone_ttl=30
+    )
+
+
+def test_fill_after_write_does_not_restore_older_row():
+    cache = make_cache()
+    key = cache.id_key(USER_ID)
+
+    async def scenario():
+        # A reader loaded version 1, the delete committed as version 2, then
+        # the reader fills the cache.
+        await cache.invalidate(USER_ID, "a@x.com", 2)
+        await cache.set(key, make_user(version=1))
+        return await cache.get(key)
+
+    assert run(scenario()) == (False, None)
+
+
+def test_fill_after_write_keeps_newer_row():
+    cache = make_cache()
+    key = cache.id_key(USER_ID)
+
+    async def scenario():
+        await cache.invalidate(USER_ID, "a@x.com", 2)
+        await cache.set(key, make_user(version=2))
+        return await cache.get(key)
+
+    hit, user = run(scenario())
+    assert hit
+    assert user.version == 2
+
+
+def test_change_feed_leaves_tombstone():
+    cache = make_cache()
+    key = cache.id_key(USER_ID)
+
+    async def scenario():
+        await cache.set(key, make_user(version=1))
+        cache.on_user_change({"id": str(USER_ID), "email": "a@x.com", "version": 2})
+        await cache.set(key, make_user(version=1))
+        return await cache.get(key)
+
+    assert run(scenario()) == (False, None)
+
+
+def test_credentials_are_not_cached():
+    cache = make_cache()
+    key = cache.id_key(USER_ID)
+
+    async def scenario():
+        await cache.set(key, make_user(version=1))
+        return await cache.get(key)
+
+    _, user = run(scenario())
+    assert "password" not in cache.local.peek(key)
+    assert user.salt is None
+    assert user.password is None
+
+
+def make_shared_caches(redis) -> tuple[UserCache, UserCache]:
+    """Two processes' caches over one Redis."""
+    caches = make_cache(), make_cache()
+    for cache in caches:
+        cache.redis = redis
+    return caches
+
+
+def test_shared_tier_serves_other_processes():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        writer, reader = make_shared_caches(redis)
+        await writer.set(writer.id_key(USER_ID), make_user(version=1))
+        by_id = await reader.get(reader.id_key(USER_ID))
+        by_email = await reader.get(reader.email_key("A@X.com"))
+        return by_id, by_email, reader, await redis.ttl(reader.id_key(USER_ID))
+
+    (hit, user), (email_hit, _), reader, ttl = run(scenario())
+    assert hit and email_hit
+    assert user.id == USER_ID and user.version == 1
+    assert reader.shared_hits == 2
+    assert reader.local.peek(reader.id_key(USER_ID)) is not None
+    assert 0 < ttl <= 300
+
+
+def test_shared_fill_does_not_replace_newer_entry():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        fresh, stale = make_shared_caches(redis)
+        key = fresh.id_key(USER_ID)
+        await fresh.set(key, make_user(version=3))
+        # A reader in another process loaded version 2 before the update.
+        await stale.set(key, make_user(version=2))
+        return json.loads(await redis.get(key))["version"]
+
+    assert run(scenario()) == 3
+
+
+def test_shared_fill_does_not_replace_tombstone():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        writer, reader = make_shared_caches(redis)
+        key = writer.id_key(USER_ID)
+        await writer.set(key, make_user(version=1))
+        await writer.invalidate(USER_ID, "a@x.com", 2)
+        # Another process read version 1 before the delete committed.
+        await reader.set(key, make_user(version=1))
+        other = make_cache()
+        other.redis = redis
+        return await redis.get(key), await redis.ttl(key), await other.get(key)
+
+    raw, ttl, lookup = run(scenario())
+    assert raw == f"{TOMBSTONE}2"
+    assert 0 < ttl <= 30
+    assert lookup == (False, None)
+
+
+def test_shared_negative_lookup_uses_negative_ttl():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        writer, reader = make_shared_caches(redis)
+        key = writer.email_key("nobody@x.com")
+        await writer.set(key, None)
+        return await redis.ttl(key), await reader.get(key)
+
+    ttl, lookup = run(scenario())
+    assert 0 < ttl <= 5
+    assert lookup == (True, None)
@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.apps.dependencies.loader import UserLoader
+
+from .conftest import run
+
+
+class SlowRepository:
+    """Answers `get_users_by_ids` after a yield, like a query over one session."""
+
+    def __init__(self, *user_ids) -> None:
+        self.users = {user_id: SimpleNamespace(id=user_id) for user_id in user_ids}
+        self.running = 0
+        self.batches: list[list] = []
+        self.overlapped = False
+        self.released_while_running = False
+
+    async def get_users_by_ids(self, *, user_ids):
+        self.running += 1
+        self.overlapped |= self.running > 1
+        self.batches.append(list(user_ids))
+        try:
+            await asyncio.sleep(0.01)
+            return [
+                self.users[user_id] for user_id in user_ids if user_id in self.users
+            ]
+        finally:
+            self.running -= 1
+
+    async def release(self) -> None:
+        self.released_while_running |= self.running > 0
+
+
+def test_batches_wait_for_the_one_in_flight():
+    first, second = uuid4(), uuid4()
+    users_repo = SlowRepository(first, second)
+    loader = UserLoader(users_repo)
+
+    async def loads():
+        first_load = asyncio.create_task(loader.load(first))
+        while not users_repo.running:
+            await asyncio.sleep(0)
+        # The first batch is in flight; this one has to wait for it.
+        return await asyncio.gather(first_load, loader.load(second))
+
+    assert [user.id for user in run(loads())] == [first, second]
+    assert users_repo.batches == [[first], [second]]
+    assert not users_repo.overlapped
+    assert not users_repo.released_while_running
+
+
+def test_cancelled_batch_cancels_its_loads():
+    user_id = uuid4()
+    users_repo = SlowRepository(user_id)
+    loader = UserLoader(users_repo)
+
+    async def cancelled_load():
+        load = asyncio.create_task(loader.load(user_id))
+        while not users_repo.running:
+            await asyncio.sleep(0)
+        loader._dispatch_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(load, timeout=1)
+        # A later load of the same id runs a fresh batch.
+        return await loader.load(user_id)
+
+    assert run(cancelled_load()).id == user_id
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.apps.users.user_repository import UsersRepository
+from src.commons.constants.enum import USER_ROLES, USER_STATUS
+from src.commons.models.user_model import User
+
+from .conftest import SyncSession, run
+
+
+def add_users(session, *users):
+    created_at = datetime(2024, 1, 1)
+    for index, (email, status) in enumerate(users):
+        session.add(
+            User(
+                email=email,
+                full_name=email,
+                salt="salt",
+                password="password",
+                role=USER_ROLES.USER,
+                status=status,
+                created_at=created_at + timedelta(minutes=index),
+            )
+        )
+    session.commit()
+
+
+def test_get_user_by_email_binds_each_call(session):
+    add_users(session, ("a@x.com", USER_STATUS.ACTIVE), ("b@y.com", USER_STATUS.ACTIVE))
+    users_repo = UsersRepository(SyncSession(session))
+
+    async def lookups():
+        return [
+            await users_repo.get_user_by_email(email=email)
+            for email in ("a@x.com", "b@y.com", "nobody@z.com")
+        ]
+
+    first, second, missing = run(lookups())
+    assert first.email == "a@x.com"
+    assert second.email == "b@y.com"
+    assert missing is None
+
+
+def test_get_filtered_users_binds_each_call(session):
+    add_users(
+        session,
+        ("a@x.com", USER_STATUS.ACTIVE),
+        ("b@y.com", USER_STATUS.ACTIVE),
+        ("c@z.com", USER_STATUS.INACTIVE),
+    )
+    users_repo = UsersRepository(SyncSession(session))
+
+    async def listings():
+        return [
+            await users_repo.get_filtered_users(limit=1),
+            await users_repo.get_filtered_users(limit=5),
+            await users_repo.get_filtered_users(status=USER_STATUS.ACTIVE),
+            await users_repo.get_filtered_users(status=USER_STATUS.INACTIVE),
+        ]
+
+    one, five, active, inactive = run(listings())
+    assert len(one) == 1
+    assert len(five) == 3
+    assert {user.email for user in active} == {"a@x.com", "b@y.com"}
+    assert [user.email for user in inactive] == ["c@z.com"]
+
+
+class ClosedSession(SyncSession):
+    """A caller's session that has already been released."""
+
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("query ran on the caller's session")
+
+
+def test_shared_lookup_runs_on_its_own_session(session):
+    add_users(session, ("a@x.com", USER_STATUS.ACTIVE))
+    users_repo = UsersRepository(ClosedSession(session))
+
+    user = run(users_repo.get_user_by_email(email="a@x.com"))
+    assert user.email == "a@x.com"
+
+
+def test_primary_lookup_is_not_shared(session):
+    add_users(session, ("a@x.com", USER_STATUS.ACTIVE))
+    users_repo = UsersRepository(ClosedSession(session))
+
+    with pytest.raises(AssertionError, match="caller's session"):
+        run(users_repo.get_user_by_email(email="a@x.com", primary=True))
+
+
+def test_lookup_after_a_write_sees_it(session):
+    users_repo = UsersRepository(SyncSession(session))
+    session.add(
+        User(
+            email="a@x.com",
+            full_name="a@x.com",
+            salt="salt",
+            password="password",
+            role=USER_ROLES.USER,
+            status=USER_STATUS.ACTIVE,
+        )
+    )
+    session.flush()
+
+    user = run(users_repo.get_user_by_email(email="a@x.com"))
+    assert user is not None and user.email == "a@x.com"
@@ -0,0 +1,54 @@
+import pytest
+
+from src.apps.users.user_service import UsersService
+from src.commons.constants.enum import USER_STATUS
+from src.commons.database.unit_of_work import UnitOfWork
+from src.commons.models.user_model import User
+from src.commons.stores.token_version import InMemoryTokenVersionStore
+
+from .conftest import SyncSession, run
+from .test_user_repository import add_users
+
+
+class UnavailableTokenVersionStore(InMemoryTokenVersionStore):
+    async def bump(self, user_id: str) -> int:
+        raise ConnectionError("token version store is down")
+
+
+def user_status(session, email: str) -> USER_STATUS:
+    session.expire_all()
+    return session.query(User).filter_by(email=email).one().status
+
+
+def test_delete_user_revokes_tokens(session):
+    add_users(session, ("a@x.com", USER_STATUS.ACTIVE))
+    user_id = session.query(User).one().id
+    token_versions = InMemoryTokenVersionStore()
+
+    result = run(
+        UsersService().delete_user(
+            user_id=user_id,
+            unit_of_work=UnitOfWork(SyncSession(session)),
+            token_versions=token_versions,
+        )
+    )
+
+    assert result.success
+    assert run(token_versions.get(user_id)) > 0
+    assert user_status(session, "a@x.com") == USER_STATUS.INACTIVE
+
+
+def test_delete_user_is_not_committed_when_revocation_fails(session):
+    add_users(session, ("a@x.com", USER_STATUS.ACTIVE))
+    user_id = session.query(User).one().id
+
+    with pytest.raises(ConnectionError):
+        run(
+            UsersService().delete_user(
+                user_id=user_id,
+                unit_of_work=UnitOfWork(SyncSession(session)),
+                token_versions=UnavailableTokenVersionStore(),
+            )
+        )
+
+    assert user_status(session, "a@x.com") == USER_STATUS.ACTIVE